@@ -0,0 +1,96 @@
+import glob
+import json
+import os
+import random
+
+PATH = os.path.abspath(os.path.dirname(__file__))
+RECORDED_CORPUS_PATH = os.path.join(PATH, "corpus")
+WORD_COUNT_PATH = os.path.join(PATH, "../data/word_count.json")
+
+VOCABULARY_SIZE = 5000  # most frequent words the synthetic readmes are made of
+TYPO_RATE = 0.01
+CODE_BLOCK_RATE = 0.2  # chance of a code block after a paragraph
+
+
+def load_recorded_corpus() -> list:
+    """
+    Load the sample readmes stored next to the benchmarks
+
+    :return: list of str
+    """
+    readmes = []
+    for path in sorted(glob.glob(os.path.join(RECORDED_CORPUS_PATH, "*.md"))):
+        with open(path) as file:
+            readmes.append(file.read())
+
+    return readmes
+
+
+def load_vocabulary(size: int = VOCABULARY_SIZE) -> list:
+    with open(WORD_COUNT_PATH) as file:
+        word_count = json.load(file)
+
+    words = sorted(word_count, key=lambda word: (-word_count[word], word))
+    return [word for word in words if word.isalpha() and word.islower()][:size]
+
+
+def make_typo(word: str, rng: random.Random) -> str:
+    if len(word) < 4:
+        return word
+
+    i = rng.randrange(len(word) - 1)
+    if rng.random() < 0.5:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2 :]  # transpose
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1 :]
+
+
+def generate_readme(rng: random.Random, vocabulary: list, paragraphs: int) -> str:
+    """
+    Generate a markdown readme of random words with some typos, code and links
+
+    :param rng: random.Random
+    :param vocabulary: list
+    :param paragraphs: int
+    :return: str
+    """
+    parts = [
+        f"# {rng.choice(vocabulary).title()}",
+        "[![Build](https://img.shields.io/badge/build-passing-green.svg)]"
+        "(https://github.com/example/project/actions)",
+    ]
+    for _ in range(paragraphs):
+        words = []
+        for _ in range(rng.randint(30, 120)):
+            word = rng.choice(vocabulary)
+            if rng.random() < TYPO_RATE:
+                word = make_typo(word, rng)
+            words.append(word)
+
+        words.insert(rng.randrange(len(words)), "[documentation](docs/index.md)")
+        words.insert(rng.randrange(len(words)), f"`{rng.choice(vocabulary)}()`")
+        parts.append(" ".join(words) + ".")
+
+        if rng.random() < CODE_BLOCK_RATE:
+            code_lines = [
+                f"{rng.choice(vocabulary)} = {rng.choice(vocabulary)}("
+                f"{rng.choice(vocabulary)}, {rng.choice(vocabulary)})"
+                for _ in range(rng.randint(3, 15))
+            ]
+            parts.append("```python\n" + "\n".join(code_lines) + "\n```")
+
+    return "\n\n".join(parts) + "\n"
+
+
+def generate_corpus(size: int, seed: int = 0, paragraphs: int = 10) -> list:
+    """
+    Generate reproducible synthetic readmes, the same seed gives the same corpus
+
+    :param size: int number of readmes
+    :param seed: int
+    :param paragraphs: int per readme
+    :return: list of str
+    """
+    rng = random.Random(seed)
+    vocabulary = load_vocabulary()
+
+    return [generate_readme(rng, vocabulary, paragraphs) for _ in range(size)]
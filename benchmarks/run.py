@@ -0,0 +1,221 @@
+"""
+Benchmarks of the typo detection and repository scanning hot paths
+
+    python -m benchmarks.run --output results.json [--baseline previous.json]
+
+Every timing is in seconds, results of two runs can be compared with --baseline
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import generate_corpus, load_recorded_corpus
+
+# main.py reads its configuration on import
+os.environ.setdefault("TELEGRAM_USER_ID", "0")
+
+DATABASE_SIZES = [100, 1000, 10000]
+DATABASE_QUERIES = 200
+
+
+def summarize(timings: list) -> dict:
+    timings = sorted(timings)
+    return {
+        "count": len(timings),
+        "total": sum(timings),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95)],
+    }
+
+
+def measure(func, items) -> dict:
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - start)
+
+    return summarize(timings)
+
+
+def bench_detector(detector, corpus: list) -> dict:
+    result = measure(detector.get_possible_typos_with_suggestions, corpus)
+    result["readmes_per_second"] = len(corpus) / result["total"]
+    result["bytes_per_second"] = sum(map(len, corpus)) / result["total"]
+
+    return result
+
+
+def bench_typo_context(detector, corpus: list) -> dict:
+    from src.repo_readme_typo import RepoReadmeTypo
+
+    typos = [
+        RepoReadmeTypo(repository="", readme=readme, word=word, suggested=suggested)
+        for readme in corpus
+        for word, suggested in detector.get_possible_typos_with_suggestions(
+            readme
+        ).items()
+    ]
+
+    return measure(RepoReadmeTypo.get_typo_with_context, typos)
+
+
+def bench_language_detector(corpus: list) -> dict:
+    from src.language_detector import LanguageDetector
+
+    return measure(LanguageDetector().is_english, corpus)
+
+
+def bench_database(sizes: list) -> dict:
+    from src.database import TinyDBProvider
+
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "db.json")
+            database = TinyDBProvider(path)
+            database.db.insert_multiple(
+                [{"word": f"word{i}"} for i in range(size)]
+                + [{"repo": f"owner/repo{i}"} for i in range(size)]
+            )
+            database.close()
+
+            # reopened, so the provider loads what was written behind its back
+            database = TinyDBProvider(path)
+
+            queries = [f"word{i * size // DATABASE_QUERIES}" for i in range(100)]
+            queries += [f"missing{i}" for i in range(DATABASE_QUERIES - 100)]
+            repos = [f"owner/repo{i}" for i in range(DATABASE_QUERIES)]
+
+            results[size] = {
+                "is_ignored": measure(database.is_ignored, queries),
+                "is_already_approved_repo": measure(
+                    database.is_already_approved_repo, repos
+                ),
+            }
+            database.close()
+
+    return results
+
+
+def bench_startup() -> dict:
+    """
+    Run client initialization of main.py in a fresh interpreter
+
+    :return: dict
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DB_PATH=os.path.join(directory, "db.json"))
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--startup-probe"],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        wall_time = time.perf_counter() - start
+
+    result = json.loads(output.strip().splitlines()[-1])
+    result["wall_seconds"] = wall_time
+
+    return result
+
+
+def startup_probe():
+    start = time.perf_counter()
+
+    import main
+
+    main.create_client()
+
+    init_seconds = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # linux
+
+    print(json.dumps({"init_seconds": init_seconds, "peak_rss_mb": peak_rss_mb}))
+
+
+def run(corpus_size: int, seed: int) -> dict:
+    import main
+    from src.typo_detector_dict import TypoDetectorDict
+
+    recorded = load_recorded_corpus()
+    synthetic = generate_corpus(corpus_size, seed=seed)
+    corpus = recorded + synthetic
+
+    detector = main.create_typo_detector()
+
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "recorded_readmes": len(recorded),
+            "synthetic_readmes": len(synthetic),
+        },
+        # the second pass shows the effect of the detector caches
+        "typo_detector_cold": bench_detector(detector, corpus),
+        "typo_detector_warm": bench_detector(detector, corpus),
+        "typo_detector_dict": bench_detector(TypoDetectorDict(), corpus),
+        "typo_context": bench_typo_context(detector, corpus),
+        "language_detector": bench_language_detector(corpus),
+        "database": bench_database(DATABASE_SIZES),
+        "startup": bench_startup(),
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and key != "count":
+            flat[f"{prefix}{key}"] = value
+
+    return flat
+
+
+def compare(results: dict, baseline: dict):
+    current, previous = flatten(results), flatten(baseline)
+    for key, value in current.items():
+        if key.startswith("meta.") or not previous.get(key):
+            continue
+        ratio = value / previous[key]
+        print(f"{key:60} {previous[key]:14.6f} -> {value:14.6f} ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run pyTypo benchmarks")
+    parser.add_argument("--output", help="write results as json to the file")
+    parser.add_argument("--baseline", help="results of a previous run to compare")
+    parser.add_argument("--corpus-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_probe:
+        startup_probe()
+        sys.exit()
+
+    results = run(args.corpus_size, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file))
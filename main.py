@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import os
@@ -6,18 +7,36 @@ from autocorrect import Speller
 from dotenv import load_dotenv
 
 from src.bot import Bot
-from src.database import TinyDBProvider
+from src.compact_dictionary import CompactDictionary
+from src.database import SQLiteProvider, TinyDBProvider
 from src.github_client import GithubClient
+from src.http_cache import HttpCache
+from src.parallel_typo_detector import ParallelTypoDetector
+from src.rate_limiter import RateLimiter
+from src.snapshot import SNAPSHOT_PATH, Snapshot
+from src.sym_speller import SymSpeller
 from src.typo_client import TypoClient
-from src.typo_detector import TypoDetector
+from src.typo_detector import WORDS_COMPACT_PATH, WORDS_PATH, TypoDetector
+from src.verdict_cache import VerdictCache, fingerprint_files
 
 load_dotenv()
 
 DB_PATH = os.getenv("DB_PATH")
+DB_BACKEND = os.getenv("DB_BACKEND", "tinydb")  # tinydb|sqlite
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "db.sqlite")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_USER_ID = int(os.getenv("TELEGRAM_USER_ID"))
+SPELLER_ENGINE = os.getenv("SPELLER_ENGINE", "autocorrect")  # autocorrect|symspell
+VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH")
+DETECTOR_WORKERS = int(os.getenv("DETECTOR_WORKERS", 1))
+README_BATCH_SIZE = int(os.getenv("README_BATCH_SIZE", 1))
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH")
+SEARCH_WINDOW_DAYS = int(os.getenv("SEARCH_WINDOW_DAYS", 1))
+WORD_SKETCH_PATH = os.getenv("WORD_SKETCH_PATH")
+
+WORD_COUNT_PATH = "data/word_count.json"
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=LOGGING_LEVEL
@@ -26,18 +45,88 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    # custom words data for autocorrect.Speller
-    with open("data/word_count.json") as file:
-        speller = Speller(nlp_data=json.load(file))
-
-    client = TypoClient(
-        github=GithubClient(GITHUB_TOKEN),
-        database=TinyDBProvider(DB_PATH),
-        typo_detector=TypoDetector(speller),
+def create_verdict_cache(read_only: bool = False):
+    if not VERDICT_CACHE_PATH:
+        return None
+
+    # verdicts depend on the speller and its data, so the cache is bound to them
+    data_fingerprint = fingerprint_files(WORD_COUNT_PATH, WORDS_PATH)
+    return VerdictCache(
+        VERDICT_CACHE_PATH,
+        fingerprint=f"{SPELLER_ENGINE}:{data_fingerprint}",
+        read_only=read_only,
     )
+
+
+def create_typo_detector(read_only_cache: bool = False) -> TypoDetector:
+    # prebuilt with "python -m src.snapshot", falls back to raw files when stale
+    snapshot = Snapshot.load(SNAPSHOT_PATH, WORD_COUNT_PATH, WORDS_PATH)
+    if snapshot is None:
+        # custom words data for the speller
+        with open(WORD_COUNT_PATH) as file:
+            snapshot = Snapshot(nlp_data=json.load(file), words=None)
+
+    if SPELLER_ENGINE == "symspell":
+        speller = SymSpeller(snapshot.nlp_data, deletes=snapshot.deletes)
+    else:
+        speller = Speller(nlp_data=snapshot.nlp_data)
+
+    # memory-mapped dictionary is shared between processes, prefer it when built
+    words = snapshot.words
+    if CompactDictionary.is_fresh(WORDS_COMPACT_PATH, WORDS_PATH):
+        words = None
+
+    cache = create_verdict_cache(read_only=read_only_cache)
+
+    return TypoDetector(speller, cache=cache, words=words)
+
+
+def create_database():
+    if DB_BACKEND == "sqlite":
+        database = SQLiteProvider(SQLITE_DB_PATH)
+        if DB_PATH:
+            database.migrate_from_tinydb(DB_PATH)
+
+        return database
+
+    return TinyDBProvider(DB_PATH)
+
+
+def create_client() -> TypoClient:
+    readme_batch_size = README_BATCH_SIZE
+    if DETECTOR_WORKERS > 1:
+        # workers only read the verdict cache, this process writes it
+        typo_detector = ParallelTypoDetector(
+            functools.partial(create_typo_detector, read_only_cache=True),
+            workers=DETECTOR_WORKERS,
+            cache=create_verdict_cache(),
+        )
+        # a smaller batch would leave workers idle
+        readme_batch_size = max(readme_batch_size, typo_detector.min_batch_size)
+    else:
+        typo_detector = create_typo_detector()
+
+    http_cache = HttpCache(HTTP_CACHE_PATH) if HTTP_CACHE_PATH else None
+
+    return TypoClient(
+        github=GithubClient(
+            GITHUB_TOKEN, http_cache=http_cache, rate_limiter=RateLimiter()
+        ),
+        database=create_database(),
+        typo_detector=typo_detector,
+        readme_batch_size=readme_batch_size,
+        search_window_days=SEARCH_WINDOW_DAYS,
+        word_sketch_path=WORD_SKETCH_PATH,
+    )
+
+
+def main():
+    client = create_client()
     bot = Bot(TELEGRAM_TOKEN, chat_id=TELEGRAM_USER_ID, client=client)
-    bot.start_polling()
+    try:
+        bot.start_polling()
+    finally:
+        client.save_word_sketch()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PYTYPOD1"
+HEADER = struct.Struct("<8sI")  # magic, words count
+# offsets are little-endian uint32 whatever the host, the array type matching it
+OFFSET_TYPECODE = next(code for code in "IL" if array(code).itemsize == 4)
+
+
+class CompactDictionary:
+    """
+    Read-only set of words stored as a sorted packed byte array
+
+    The file is memory-mapped, so processes opening the same file share its pages
+    instead of holding their own copy of the words.
+    File layout: header, (count + 1) little-endian uint32 offsets,
+    concatenated utf-8 words
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count = HEADER.unpack_from(self.mm)
+        if magic != MAGIC:
+            raise ValueError(f'"{path}" is not a compact dictionary file')
+
+        self.words_start = HEADER.size + (self.count + 1) * 4
+        self.view = memoryview(self.mm)
+        offsets = self.view[HEADER.size : self.words_start]
+        if sys.byteorder == "little":
+            # the mapped pages are read in place
+            self.offsets = offsets.cast(OFFSET_TYPECODE)
+        else:
+            self.offsets = array(OFFSET_TYPECODE, offsets.tobytes())
+            self.offsets.byteswap()
+            offsets.release()
+
+    def close(self):
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.view.release()
+        self.mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str):
+            return False
+
+        try:
+            key = word.encode("utf-8")
+        except UnicodeEncodeError:
+            return False
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current = self.get_word_bytes(middle)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return True
+
+        return False
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.get_word_bytes(index).decode("utf-8")
+
+    def get_word_bytes(self, index: int) -> bytes:
+        start = self.words_start + self.offsets[index]
+        end = self.words_start + self.offsets[index + 1]
+
+        return self.mm[start:end]
+
+    @staticmethod
+    def build(words, path: str) -> int:
+        """
+        Write words to a compact dictionary file
+
+        :param words: iterable of str
+        :param path: str
+        :return: int number of words written
+        """
+        encoded = sorted({word.encode("utf-8") for word in words})
+
+        offsets = array(OFFSET_TYPECODE, [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        # write to a temporary file first, so processes never map a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(encoded)))
+            file.write(offsets.tobytes())
+            file.write(b"".join(encoded))
+        os.replace(tmp_path, path)
+
+        return len(encoded)
+
+    @staticmethod
+    def is_fresh(path: str, source_path: str) -> bool:
+        """
+        Check whether the compact dictionary was built after its source was changed
+
+        :param path: str
+        :param source_path: str
+        :return: bool
+        """
+        if not os.path.exists(path):
+            return False
+
+        if not os.path.exists(source_path):
+            return True
+
+        return os.path.getmtime(path) >= os.path.getmtime(source_path)
+
+
+if __name__ == "__main__":
+    from src.typo_detector import WORDS_COMPACT_PATH, WORDS_PATH
+
+    parser = argparse.ArgumentParser(
+        description="Build compact dictionary file from a plain words list"
+    )
+    parser.add_argument("source", nargs="?", default=os.path.normpath(WORDS_PATH))
+    parser.add_argument(
+        "target", nargs="?", default=os.path.normpath(WORDS_COMPACT_PATH)
+    )
+    args = parser.parse_args()
+
+    with open(args.source) as word_file:
+        count = CompactDictionary.build(word_file.read().split(), args.target)
+
+    print(f'{count} words written to "{args.target}"')
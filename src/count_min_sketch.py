@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import os
+import struct
+from array import array
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PYTYPOC2"
+HEADER = struct.Struct("<8sIIQ")  # magic, width, depth, total
+DEFAULT_WIDTH = 1 << 16
+DEFAULT_DEPTH = 4
+
+
+class CountMinSketch:
+    """
+    Approximate word counts in fixed memory: a word is never undercounted
+    and is overcounted by about total / width at most
+
+    With max_total set, all counts are halved whenever the total exceeds it,
+    so the overcount stays bounded however long the stream is
+    and the estimates favour recently seen words
+
+    Hashing is stable between processes, so the sketch can be saved and loaded
+    """
+
+    def __init__(
+        self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH, max_total=None
+    ):
+        self.width = width
+        self.depth = depth
+        self.max_total = max_total
+        self.total = 0
+        self.counts = array("I", bytes(4 * width * depth))
+
+    def get_indexes(self, word: str) -> list:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        first, second = struct.unpack("<II", digest)
+
+        # double hashing gives a row-independent column in every row
+        return [
+            row * self.width + (first + row * second) % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, word: str, count: int = 1):
+        for index in self.get_indexes(word):
+            self.counts[index] = min(self.counts[index] + count, 0xFFFFFFFF)
+
+        self.total += count
+        if self.max_total is not None and self.total > self.max_total:
+            self.halve()
+
+    def update(self, counts: dict):
+        for word, count in counts.items():
+            self.add(word, count)
+
+    def estimate(self, word: str) -> int:
+        return min(self.counts[index] for index in self.get_indexes(word))
+
+    def halve(self):
+        self.counts = array("I", (count >> 1 for count in self.counts))
+        # every row holds the whole total
+        self.total = sum(self.counts[: self.width])
+        logger.debug(f"Word sketch halved, total is {self.total}")
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, self.width, self.depth, self.total))
+            self.counts.tofile(file)
+
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        max_total=None,
+    ) -> "CountMinSketch":
+        """
+        Load a saved sketch, an empty one is returned
+        when the file is missing or was saved with other dimensions
+
+        :param path: str
+        :param width: int
+        :param depth: int
+        :param max_total: int total to halve the counts at, None to never halve
+        :return: CountMinSketch
+        """
+        sketch = cls(width, depth, max_total)
+
+        try:
+            with open(path, "rb") as file:
+                header = file.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    raise EOFError
+
+                magic, saved_width, saved_depth, total = HEADER.unpack(header)
+                if (magic, saved_width, saved_depth) != (MAGIC, width, depth):
+                    logger.warning(f'Word sketch "{path}" is incompatible, ignoring')
+                    return sketch
+
+                counts = array("I")
+                counts.fromfile(file, width * depth)
+                sketch.counts = counts
+                sketch.total = total
+        except FileNotFoundError:
+            pass
+        except EOFError:
+            logger.warning(f'Word sketch "{path}" is truncated, ignoring')
+
+        while max_total is not None and sketch.total > max_total:
+            sketch.halve()
+
+        return sketch
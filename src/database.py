@@ -1,15 +1,31 @@
+import json
 import logging
+import os
+import sqlite3
+import threading
 
 from tinydb import Query, TinyDB
 
 logger = logging.getLogger(__name__)
 
+MAX_QUERY_PARAMETERS = 900  # below the default SQLite limit of 999
+
 
 class TinyDBProvider:
     def __init__(self, db_path: str):
         self.db = TinyDB(db_path)
+        self.state = self.db.table("state")
         self.query = Query()
 
+        # the table is read once, lookups are served from the indexes
+        self.ignored_words = set()
+        self.approved_repos = set()
+        for document in self.db.all():
+            if "word" in document:
+                self.ignored_words.add(document["word"])
+            if "repo" in document:
+                self.approved_repos.add(document["repo"])
+
     def close(self):
         self.db.close()
 
@@ -18,6 +34,7 @@ class TinyDBProvider:
             return -1
 
         logger.info(f'Adding "{repository_name}" to approved repo list')
+        self.approved_repos.add(repository_name.lower())
         return self.db.insert(
             {
                 "repo": repository_name.lower(),
@@ -31,10 +48,208 @@ class TinyDBProvider:
             return -1
 
         logger.info(f'Adding "{word}" to ignore list')
+        self.ignored_words.add(word.lower())
         self.db.insert({"word": word.lower()})
 
-    def is_ignored(self, word):
-        return self.db.search(self.query.word == word.lower())
+    def add_many_to_ignored(self, words: list) -> int:
+        new_words = {word.lower() for word in words} - self.ignored_words
+        if not new_words:
+            return 0
+
+        logger.info(f"Adding {sorted(new_words)} to ignore list")
+        self.ignored_words.update(new_words)
+        self.db.insert_multiple([{"word": word} for word in sorted(new_words)])
+
+        return len(new_words)
+
+    def is_ignored(self, word) -> bool:
+        return word.lower() in self.ignored_words
+
+    def filter_not_ignored(self, words: list) -> list:
+        return [word for word in words if word.lower() not in self.ignored_words]
+
+    def filter_not_approved(self, repository_names: list) -> list:
+        return [
+            name for name in repository_names if name.lower() not in self.approved_repos
+        ]
+
+    def is_already_approved_repo(self, repository_name) -> bool:
+        return repository_name.lower() in self.approved_repos
+
+    def get_state(self, key: str):
+        document = self.state.get(self.query.key == key)
+
+        return document["value"] if document else None
+
+    def set_state(self, key: str, value):
+        self.state.upsert({"key": key, "value": value}, self.query.key == key)
+
+
+class SQLiteProvider:
+    """
+    TinyDBProvider counterpart backed by SQLite in WAL mode,
+    safe to share between several processes
+    """
+
+    MIGRATED_STATE = "migrated_from_tinydb"
+
+    def __init__(self, db_path: str):
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS ignored (word TEXT PRIMARY KEY)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS approved ("
+            "repo TEXT PRIMARY KEY, typo TEXT, suggested TEXT)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def migrate_from_tinydb(self, tinydb_path: str):
+        """
+        Copy ignored words and approved repos of a TinyDB file, only once
+
+        :param tinydb_path: str
+        :return:
+        """
+        if self.get_state(self.MIGRATED_STATE) or not os.path.exists(tinydb_path):
+            return
+
+        with open(tinydb_path) as file:
+            content = json.load(file) if os.path.getsize(tinydb_path) else {}
+
+        documents = content.get("_default", {}).values()
+        words = [(doc["word"],) for doc in documents if "word" in doc]
+        repos = [
+            (doc["repo"], doc.get("typo"), doc.get("suggested"))
+            for doc in documents
+            if "repo" in doc
+        ]
+        states = [
+            (doc["key"], json.dumps(doc["value"]))
+            for doc in content.get("state", {}).values()
+        ]
+
+        with self.lock, self.db:
+            self.db.executemany("INSERT OR IGNORE INTO ignored VALUES (?)", words)
+            self.db.executemany(
+                "INSERT OR IGNORE INTO approved VALUES (?, ?, ?)", repos
+            )
+            self.db.executemany("INSERT OR IGNORE INTO state VALUES (?, ?)", states)
+            self.db.execute(
+                "REPLACE INTO state VALUES (?, ?)", (self.MIGRATED_STATE, "true")
+            )
+
+        logger.info(
+            f"Migrated {len(words)} ignored words and {len(repos)} approved repos "
+            f'from "{tinydb_path}"'
+        )
+
+    def add_to_approved(self, repository_name: str, typo: str, suggested: str) -> int:
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO approved (repo, typo, suggested) "
+                "VALUES (?, ?, ?)",
+                (repository_name.lower(), typo.lower(), suggested.lower()),
+            )
+
+        if not cursor.rowcount:
+            return -1
+
+        logger.info(f'Adding "{repository_name}" to approved repo list')
+        return cursor.lastrowid
+
+    def add_to_ignored(self, word: str) -> int:
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO ignored (word) VALUES (?)", (word.lower(),)
+            )
+
+        if not cursor.rowcount:
+            return -1
+
+        logger.info(f'Adding "{word}" to ignore list')
+        return cursor.lastrowid
+
+    def add_many_to_ignored(self, words: list) -> int:
+        with self.lock, self.db:
+            inserted = self.db.executemany(
+                "INSERT OR IGNORE INTO ignored (word) VALUES (?)",
+                [(word.lower(),) for word in words],
+            ).rowcount
+
+        if inserted:
+            logger.info(f"Adding {inserted} words to ignore list")
+        return inserted
+
+    def select_existing(self, table: str, column: str, values: list) -> set:
+        """
+        Find which of the values are stored, in as few queries as possible
+
+        :param table: str
+        :param column: str
+        :param values: list of str
+        :return: set of str
+        """
+        values = list({value.lower() for value in values})
+        existing = set()
+
+        with self.lock:
+            for start in range(0, len(values), MAX_QUERY_PARAMETERS):
+                chunk = values[start : start + MAX_QUERY_PARAMETERS]
+                rows = self.db.execute(
+                    f"SELECT {column} FROM {table} "
+                    f"WHERE {column} IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                existing.update(row[0] for row in rows)
+
+        return existing
+
+    def filter_not_ignored(self, words: list) -> list:
+        ignored = self.select_existing("ignored", "word", words)
+
+        return [word for word in words if word.lower() not in ignored]
+
+    def filter_not_approved(self, repository_names: list) -> list:
+        approved = self.select_existing("approved", "repo", repository_names)
+
+        return [name for name in repository_names if name.lower() not in approved]
+
+    def is_ignored(self, word) -> bool:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT 1 FROM ignored WHERE word = ?", (word.lower(),)
+            ).fetchone()
+
+        return row is not None
+
+    def is_already_approved_repo(self, repository_name) -> bool:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT 1 FROM approved WHERE repo = ?", (repository_name.lower(),)
+            ).fetchone()
+
+        return row is not None
+
+    def get_state(self, key: str):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT value FROM state WHERE key = ?", (key,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
 
-    def is_already_approved_repo(self, repository_name):
-        return self.db.search(self.query.repo == repository_name.lower())
+    def set_state(self, key: str, value):
+        with self.lock, self.db:
+            self.db.execute(
+                "REPLACE INTO state VALUES (?, ?)", (key, json.dumps(value))
+            )
@@ -1,10 +1,18 @@
+import datetime
 import logging
+import threading
+import time
 import urllib.parse
+from typing import NamedTuple
 
+from cachetools import TTLCache
 from github3 import GitHub, exceptions
 from github3.pulls import PullRequest
 from github3.repos.repo import Repository
 
+from src.http_cache import CachingAdapter, HttpCache
+from src.rate_limiter import RateLimitedAdapter, RateLimiter
+
 logger = logging.getLogger(__name__)
 logging.getLogger("github3").setLevel(logging.WARNING)
 
@@ -12,43 +20,328 @@ TYPO_BRANCH_NAME = "fix-readme-typo"
 TYPO_COMMIT_MESSAGE = "Fix readme typo"
 TYPO_PULL_REQUEST_TITLE = "Fix readme typo"
 
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_PAGE_SIZE = 25  # repositories fetched by a single query
+README_EXPRESSIONS = [
+    "HEAD:README.md",
+    "HEAD:readme.md",
+    "HEAD:Readme.md",
+    "HEAD:README.rst",
+    "HEAD:README",
+]
+README_FIELDS = " ".join(
+    f'readme{i}: object(expression: "{expression}") '
+    f"{{ ... on Blob {{ text isTruncated byteSize }} }}"
+    for i, expression in enumerate(README_EXPRESSIONS)
+)
+REPOSITORY_FIELDS = (
+    f"nameWithOwner stargazerCount defaultBranchRef {{ name target {{ oid }} }} "
+    f"{README_FIELDS}"
+)
+
+IDENTITY_TTL = 24 * 60 * 60  # seconds
+REPOSITORY_CACHE_SIZE = 256
+REPOSITORY_TTL = 10 * 60
+README_CACHE_SIZE = 256
+README_TTL = 10 * 60
+
+SEARCH_PAGE_SIZE = 100
+SEARCH_MAX_RESULTS = 1000  # github search never returns more
+
+PULL_REQUEST_STEP_RETRIES = 3
+PULL_REQUEST_STEP_DELAY = 2  # seconds, grows with every retry
+RETRYABLE_ERRORS = (
+    exceptions.ConnectionError,
+    exceptions.NotFoundError,  # fresh fork is created asynchronously
+    exceptions.ServerError,
+)
+
+
+class RepositoryDetails(NamedTuple):
+    full_name: str
+    stargazers_count: int
+    default_branch: str
+    head_sha: str
+    # None when no README_EXPRESSIONS matched, it may be elsewhere,
+    # or the matched blob was too big for GraphQL to return it whole
+    readme: str
+
+
+class Readme(NamedTuple):
+    path: str
+    text: str
+    head_sha: str = None  # commit the text was read at, when known
+
 
 class GithubClient:
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        http_cache: HttpCache = None,
+        rate_limiter: RateLimiter = None,
+    ):
         self.gh = GitHub(token=token)
+        self.rate_limiter = rate_limiter
+
+        # cached reads, entries of a repository are dropped after writes to it
+        self.cache_lock = threading.RLock()
+        self.identity = TTLCache(maxsize=1, ttl=IDENTITY_TTL)
+        self.repositories = TTLCache(maxsize=REPOSITORY_CACHE_SIZE, ttl=REPOSITORY_TTL)
+        self.readmes = TTLCache(maxsize=README_CACHE_SIZE, ttl=README_TTL)
+
+        adapter = None
+        if http_cache is not None:
+            # revalidate reads, GitHub does not count 304 against the rate limit
+            adapter = CachingAdapter(http_cache)
+        if rate_limiter is not None:
+            adapter = RateLimitedAdapter(rate_limiter, adapter)
+
+        if adapter is not None:
+            self.gh.session.mount("https://", adapter)
 
     def get_most_starred_repos_for_date(self, date):
         return self.gh.search_repositories(
             "created:{0}..{0}".format(date), order="stars"
         )
 
+    def get_most_starred_repos_for_window(self, start, end, min_stars: int):
+        """
+        Search repositories created within the window with at least min_stars,
+        the window is split in halves, the newer first, while it has more
+        results than the search can return; pages are fetched lazily
+
+        :param start: date first day of the window
+        :param end: date last day of the window
+        :param min_stars: int
+        :return: generator of repository search results, by stars within a window
+        """
+        results = self.gh.search_repositories(
+            f"created:{start}..{end} stars:>={min_stars}",
+            sort="stars",
+            order="desc",
+            per_page=SEARCH_PAGE_SIZE,
+        )
+
+        # GitHubIterator restarts from the first page on every iter() call
+        # and next() keeps a cursor of its own, so a single iterator is used
+        iterator = iter(results)
+        first = next(iterator, None)  # fetches the first page and the total count
+        if first is None:
+            return
+
+        if results.total_count > SEARCH_MAX_RESULTS and start < end:
+            middle = start + (end - start) // 2
+            logger.debug(
+                f"{results.total_count} repos created {start}..{end}, splitting"
+            )
+
+            yield from self.get_most_starred_repos_for_window(
+                middle + datetime.timedelta(days=1), end, min_stars
+            )
+            yield from self.get_most_starred_repos_for_window(start, middle, min_stars)
+            return
+
+        yield first
+        yield from iterator
+
+    def get_my_typo_pull_requests(self, state: str, closed_since: str = None):
+        """
+        Find typo fix pull requests of current user with a single search
+
+        :param state: str "open" or "closed"
+        :param closed_since: str ISO 8601 time, only closed at or after it
+        :return: generator of (str repository name, datetime closed at,
+            int pull request number) tuples
+        """
+        query = f"is:pr author:{self.get_me()} is:{state} head:{TYPO_BRANCH_NAME}"
+        if closed_since:
+            query += f" closed:>={closed_since}"
+
+        for result in self.gh.search_issues(query, sort="updated", order="asc"):
+            issue = result.issue
+            # https://github.com/owner/repo/pull/1
+            owner, repository_name = issue.html_url.split("/")[3:5]
+
+            yield f"{owner}/{repository_name}", issue.closed_at, issue.number
+
+    def get_pull_request_head_repository(self, repository: str, number: int):
+        """
+        Get repository the pull request was opened from, e.g. a fork of any name
+
+        :param repository: str "owner/repo" the pull request was opened to
+        :param number: int
+        :return: Repository or None when the head repository is deleted
+        """
+        owner, repository_name = repository.split("/")
+        pull_request = self.gh.pull_request(owner, repository_name, number)
+
+        head_owner, head_name = pull_request.head.repo
+        if not head_name:
+            return None
+
+        return self.get_repository_by_name(f"{head_owner}/{head_name}")
+
     def get_my_public_repositories(self):
         return self.gh.repositories(type="public")
 
     def get_me(self) -> str:
-        return self.gh.me()
+        with self.cache_lock:
+            me = self.identity.get("me")
+
+        if me is None:
+            me = self.gh.me()
+            with self.cache_lock:
+                self.identity["me"] = me
+
+        return me
+
+    @staticmethod
+    def get_cache_key(repository) -> str:
+        if not isinstance(repository, str):
+            repository = repository.full_name
+
+        # repository names are case insensitive
+        return repository.replace("https://github.com/", "").lower()
+
+    def invalidate(self, repository):
+        """
+        Drop cached repository object and readme, e.g. after writing to it
+
+        :param repository: str or Repository
+        :return:
+        """
+        key = self.get_cache_key(repository)
+
+        with self.cache_lock:
+            self.repositories.pop(key, None)
+            self.readmes.pop(key, None)
 
     def get_repository_by_name(self, name: str) -> Repository:
-        owner, repository_name = name.replace("https://github.com/", "").split("/")
+        key = self.get_cache_key(name)
+        with self.cache_lock:
+            repository = self.repositories.get(key)
+
+        if repository is None:
+            owner, repository_name = name.replace("https://github.com/", "").split("/")
+            repository = self.gh.repository(owner, repository_name)
 
-        return self.gh.repository(owner, repository_name)
+            with self.cache_lock:
+                self.repositories[key] = repository
+
+        return repository
 
     def get_repository_readme(self, repository: object) -> str:
+        return self.get_readme(repository).text
+
+    def get_readme(self, repository: object) -> Readme:
+        """
+        Get readme of the repository with its path in the repository
+
+        :param repository: str or Repository
+        :return: Readme, path is None when there is no readme
+        """
+        key = self.get_cache_key(repository)
+        with self.cache_lock:
+            cached = self.readmes.get(key)
+
+        if cached is not None:
+            return cached
+
         try:
             if isinstance(repository, str):
                 repository = self.get_repository_by_name(repository)
 
-            return repository.readme().decoded.decode("utf-8")
+            contents = repository.readme()
+            cached = Readme(contents.path, contents.decoded.decode("utf-8"))
+            with self.cache_lock:
+                self.readmes[key] = cached
+
+            return cached
         except exceptions.NotFoundError as e:
             logger.debug(f"No readme found: {e}")
 
-        return ""
+        return Readme(None, "")
+
+    def get_repositories_details(self, names: list) -> dict:
+        """
+        Fetch readme, stars, default branch and its head sha
+        of all the repositories with a single GraphQL query
+
+        :param names: list of str "owner/repo", at most GRAPHQL_PAGE_SIZE of them
+        :return: dict of str name to RepositoryDetails, missing repos are left out,
+            readme is None when none of README_EXPRESSIONS matched
+            or the readme was truncated
+        """
+        if not names:
+            return {}
+
+        variables = {}
+        arguments = []
+        aliases = []
+        for i, name in enumerate(names):
+            variables[f"owner{i}"], variables[f"name{i}"] = name.split("/")
+            arguments.append(f"$owner{i}: String!, $name{i}: String!")
+            aliases.append(
+                f"repo{i}: repository(owner: $owner{i}, name: $name{i}) "
+                f"{{ {REPOSITORY_FIELDS} }}"
+            )
+        query = f"query({', '.join(arguments)}) {{ {' '.join(aliases)} }}"
+
+        response = self.gh.session.post(
+            GRAPHQL_URL, json={"query": query, "variables": variables}
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        for error in result.get("errors", []):
+            logger.debug(f"GraphQL error: {error.get('message')}")
+
+        details = {}
+        for i, name in enumerate(names):
+            repository = (result.get("data") or {}).get(f"repo{i}")
+            if repository is None:
+                continue
+
+            path, blob = next(
+                (
+                    (expression.split(":", 1)[1], blob)
+                    for j, expression in enumerate(README_EXPRESSIONS)
+                    if (blob := repository[f"readme{j}"])
+                ),
+                (None, {}),
+            )
+            readme = blob.get("text")
+            if blob.get("isTruncated"):
+                # the rest of the text is only served by the REST readme endpoint
+                logger.debug(f"Truncated readme of {name}: {blob.get('byteSize')}B")
+                readme = None
+
+            branch = repository["defaultBranchRef"] or {}
+
+            details[name] = RepositoryDetails(
+                full_name=repository["nameWithOwner"],
+                stargazers_count=repository["stargazerCount"],
+                default_branch=branch.get("name"),
+                head_sha=(branch.get("target") or {}).get("oid"),
+                readme=readme,
+            )
+
+            # spares a readme request if a typo in the repo gets approved
+            if readme:
+                with self.cache_lock:
+                    self.readmes[self.get_cache_key(name)] = Readme(
+                        path, readme, details[name].head_sha
+                    )
+
+        return details
 
     def delete_repository(self, repository: object) -> bool:
         try:
             if isinstance(repository, str):
                 repository = self.get_repository_by_name(repository)
 
+            self.invalidate(repository)
+
             return repository.delete()
         except exceptions.NotFoundError:
             logger.warning("No Repo found")
@@ -68,43 +361,142 @@ class GithubClient:
 
         return self.delete_repository(fork_repo_name)
 
+    def get_fork(self, repo: Repository) -> Repository:
+        """
+        Get fork of the repo on current user's account, forking it if needed
+
+        :param repo: Repository
+        :return: Repository
+        """
+        try:
+            fork = self.get_repository_by_name(f"{self.get_me()}/{repo.name}")
+
+            if fork.fork and fork.parent.full_name == repo.full_name:
+                return fork
+        except exceptions.NotFoundError:
+            pass
+
+        # forking an already forked repo just returns the existing fork
+        return repo.create_fork()
+
+    def sync_fork(self, fork: Repository, branch: str):
+        """
+        Bring the fork branch up to date with upstream
+
+        :param fork: Repository
+        :param branch: str
+        :return:
+        """
+        response = self.gh.session.post(
+            f"{fork.url}/merge-upstream", json={"branch": branch}
+        )
+        if response.status_code == 409:
+            # diverged, the fix is committed on top of upstream anyway
+            logger.warning(f'Fork "{fork.full_name}" could not be synced')
+        elif response.status_code not in (200, 404):
+            response.raise_for_status()
+
+    def set_branch(self, fork: Repository, sha: str):
+        """
+        Point typo branch of the fork to the commit, creating the branch if needed
+
+        :param fork: Repository
+        :param sha: str
+        :return:
+        """
+        try:
+            fork.ref(f"heads/{TYPO_BRANCH_NAME}").update(sha, force=True)
+        except exceptions.NotFoundError:
+            fork.create_ref(f"refs/heads/{TYPO_BRANCH_NAME}", sha)
+
+    def get_or_create_pull_request(self, repo: Repository) -> PullRequest:
+        head = "{}:{}".format(self.get_me(), TYPO_BRANCH_NAME)
+
+        # an open pull request follows the force updated branch
+        for pull_request in repo.pull_requests(state="open", head=head):
+            return pull_request
+
+        return repo.create_pull(
+            title=TYPO_PULL_REQUEST_TITLE, base=repo.default_branch, head=head
+        )
+
+    @staticmethod
+    def run_step(name: str, func, *args):
+        """
+        Run a step of pull request creation, timing it
+        and retrying errors which may go away, e.g. a fork that is not ready yet
+
+        :param name: str
+        :param func: callable
+        :return: result of func
+        """
+        for attempt in range(1, PULL_REQUEST_STEP_RETRIES + 1):
+            start = time.perf_counter()
+            try:
+                result = func(*args)
+                logger.info(f'"{name}" took {time.perf_counter() - start:.2f}s')
+
+                return result
+            except RETRYABLE_ERRORS as e:
+                if attempt == PULL_REQUEST_STEP_RETRIES:
+                    raise
+                logger.warning(f'"{name}" failed ({e}), retrying')
+                time.sleep(PULL_REQUEST_STEP_DELAY * attempt)
+
     def create_fix_typo_pull_request(
         self, typo_readme_repository, modified_readme
     ) -> PullRequest:
         """
-        Clone repo and create a PullRequest with typo fix
+        Commit typo fix to a fork with Git Data API and create a PullRequest
+
+        Every step can be retried: an existing fork, typo branch
+        and open pull request are reused, so the fork is kept on failure
 
         :param typo_readme_repository: str
         :param modified_readme: str
         :return: PullRequest
         """
         repo = self.get_repository_by_name(typo_readme_repository)
+        branch = repo.default_branch
 
-        fork = repo.create_fork()
-
-        try:
-            ref = fork.ref("heads/{}".format(repo.default_branch))
-            fork.create_branch_ref(TYPO_BRANCH_NAME, ref.object.sha)
-
-            # commit modified readme
-            fork.readme().update(
-                TYPO_COMMIT_MESSAGE,
-                branch=TYPO_BRANCH_NAME,
-                content=modified_readme.encode("utf-8"),
-            )
+        fork = self.run_step("fork", self.get_fork, repo)
+        self.run_step("sync fork", self.sync_fork, fork, branch)
 
-            pull_request = repo.create_pull(
-                title=TYPO_PULL_REQUEST_TITLE,
-                base=repo.default_branch,
-                head="{}:{}".format(self.get_me(), TYPO_BRANCH_NAME),
-            )
+        # the fix is based on the commit the readme was read at,
+        # so changes made since then are not overwritten by a stale readme
+        readme = self.get_readme(repo)
+        head_sha = readme.head_sha or self.run_step(
+            "read head", lambda: repo.ref(f"heads/{branch}").object.sha
+        )
+        base_tree = self.run_step(
+            "read tree", lambda: repo.git_commit(head_sha).tree.sha
+        )
 
-            return pull_request
-        except Exception as e:
-            logger.exception("Deleting fork")
-            fork.delete()
+        # the tree takes the content inline, so no separate blob is created
+        tree = self.run_step(
+            "create tree",
+            fork.create_tree,
+            [
+                {
+                    "path": readme.path,
+                    "mode": "100644",
+                    "type": "blob",
+                    "content": modified_readme,
+                }
+            ],
+            base_tree,
+        )
+        commit = self.run_step(
+            "create commit",
+            fork.create_commit,
+            TYPO_COMMIT_MESSAGE,
+            tree.sha,
+            [head_sha],
+        )
+        self.run_step("set branch", self.set_branch, fork, commit.sha)
+        self.invalidate(fork)
 
-            raise e
+        return self.run_step("pull request", self.get_or_create_pull_request, repo)
 
     @staticmethod
     def get_repo_link(repository) -> str:
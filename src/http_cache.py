@@ -0,0 +1,214 @@
+import json
+import logging
+import sqlite3
+import threading
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_FRACTION = 0.1  # part of the size limit freed at once when the cache is full
+USES_FLUSH_SIZE = 100  # recency updates of hits written at once
+
+# the body is stored decoded so these no longer describe it
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class HttpCache:
+    """
+    Persistent store of http responses with their validators backed by SQLite,
+    least recently used responses are dropped once the bodies exceed max_bytes
+    """
+
+    hits = 0
+    misses = 0
+
+    def __init__(self, db_path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # recency of hits is written in batches, so a hit does not hold the
+        # write lock of the database shared with other processes
+        self.uses = {}
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, "
+            "body BLOB, size INTEGER, used_at INTEGER)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+        self.db.commit()
+
+        self.size, self.clock = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used_at), 0) FROM responses"
+        ).fetchone()
+
+    def close(self):
+        logger.info("Http cache stats: %s", self.stats())
+        with self.lock:
+            self.flush_uses()
+            self.db.commit()
+            self.db.close()
+
+    def get(self, key: str):
+        """
+        Get cached response
+
+        :param key: str
+        :return: tuple of etag, last modified, headers dict and body or None
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.clock += 1
+            self.uses[key] = self.clock
+
+            if len(self.uses) >= USES_FLUSH_SIZE:
+                self.flush_uses()
+                self.db.commit()
+
+        etag, last_modified, headers, body = row
+        return etag, last_modified, json.loads(headers), body
+
+    def put(self, key: str, etag: str, last_modified: str, headers: dict, body: bytes):
+        with self.lock:
+            self.clock += 1
+            previous = self.db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.db.execute(
+                "REPLACE INTO responses "
+                "(key, etag, last_modified, headers, body, size, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    etag,
+                    last_modified,
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    self.clock,
+                ),
+            )
+            self.size += len(body) - (previous[0] if previous else 0)
+
+            if self.size > self.max_bytes:
+                self.flush_uses()
+                self.evict()
+
+            self.db.commit()
+
+    def flush_uses(self):
+        self.db.executemany(
+            "UPDATE responses SET used_at = ? WHERE key = ?",
+            [(used_at, key) for key, used_at in self.uses.items()],
+        )
+        self.uses = {}
+
+    def evict(self):
+        """
+        Drop least recently used responses to keep the cache within its size limit
+
+        :return:
+        """
+        target = self.max_bytes - int(self.max_bytes * EVICT_FRACTION)
+        rows = self.db.execute("SELECT key, size FROM responses ORDER BY used_at")
+
+        keys = []
+        for key, size in rows:
+            if self.size <= target:
+                break
+            keys.append((key,))
+            self.size -= size
+
+        self.db.executemany("DELETE FROM responses WHERE key = ?", keys)
+        logger.debug(f"Evicted {len(keys)} responses, {self.size} bytes left")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self.size}
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Transport adapter revalidating cached GET responses with If-None-Match
+    and If-Modified-Since, a 304 is answered with the cached response
+    """
+
+    def __init__(self, cache: HttpCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    @staticmethod
+    def get_key(request) -> str:
+        # responses vary by the requested media type
+        return f"{request.headers.get('Accept', '')} {request.url}"
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        key = self.get_key(request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.hits += 1
+            return self.build_cached_response(request, response, cached)
+
+        self.cache.misses += 1
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            headers = {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            }
+            self.cache.put(key, etag, last_modified, headers, response.content)
+
+        return response
+
+    def build_cached_response(self, request, not_modified: Response, cached):
+        _, _, headers, body = cached
+
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(headers)
+        # fresh rate limit and other headers of the 304 take precedence
+        response.headers.update(
+            (name, value)
+            for name, value in not_modified.headers.items()
+            if name.lower() not in SKIPPED_HEADERS
+        )
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+
+        return response
@@ -1,12 +1,39 @@
+import hashlib
 import logging
+import re
+import threading
+from collections import OrderedDict
 
-from langdetect import detect
+from langdetect import DetectorFactory, detect
 from langdetect.lang_detect_exception import LangDetectException
 
 logger = logging.getLogger(__name__)
 
+# langdetect is random unless seeded
+DetectorFactory.seed = 0
+
+MAX_SAMPLE_LENGTH = 3000  # longer texts are sampled before language detection
+MAX_CACHED_VERDICTS = 10_000
+
+MIN_SCORED_WORDS = 30  # shorter texts are always passed to langdetect
+CLEAR_ENGLISH_RATIO = 0.2  # share of English stopwords in clearly English text
+NON_LATIN_RATIO = 0.3  # share of non-latin letters in clearly foreign text
+
+ENGLISH_STOPWORDS = frozenset(
+    "a about after all also an and any are as at be because been but by can "
+    "could do does for from has have how if in into is it its may more most no "
+    "not of on once only or other our should so some such than that the their "
+    "them then there these they this to use used using was we were what when "
+    "which while will with would you your".split()
+)
+WORD_REGEX = re.compile(r"[^\W\d_]+")
+
 
 class LanguageDetector:
+    def __init__(self):
+        self.verdicts = OrderedDict()  # text hash -> is english, least recent first
+        self.lock = threading.Lock()
+
     @staticmethod
     def detect(text: str) -> str:
         try:
@@ -15,5 +42,66 @@ class LanguageDetector:
             logger.warning("Error detecting language")
         return ""
 
+    @staticmethod
+    def get_sample(text: str) -> str:
+        """
+        Take the beginning, middle and end of a long text
+
+        :param text: str
+        :return: str
+        """
+        if len(text) <= MAX_SAMPLE_LENGTH:
+            return text
+
+        size = MAX_SAMPLE_LENGTH // 3
+        middle = (len(text) - size) // 2
+
+        return "\n".join([text[:size], text[middle : middle + size], text[-size:]])
+
+    @staticmethod
+    def classify(text: str):
+        """
+        Cheaply tell whether the text is clearly English or clearly not
+
+        :param text: str
+        :return: bool or None when it is not clear
+        """
+        words = WORD_REGEX.findall(text.lower())
+        letters_count = sum(map(len, words))
+        if not letters_count:
+            return None
+
+        non_latin_count = sum(1 for word in words for char in word if char > "\x7f")
+        if non_latin_count / letters_count > NON_LATIN_RATIO:
+            return False
+
+        if len(words) < MIN_SCORED_WORDS:
+            return None
+
+        stopwords_ratio = sum(word in ENGLISH_STOPWORDS for word in words) / len(words)
+        if stopwords_ratio >= CLEAR_ENGLISH_RATIO:
+            return True
+
+        # latin texts with few english stopwords are left to langdetect
+        return None
+
     def is_english(self, text: str) -> bool:
-        return self.detect(text) == "en"
+        key = hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+
+        with self.lock:
+            if key in self.verdicts:
+                self.verdicts.move_to_end(key)
+                return self.verdicts[key]
+
+        sample = self.get_sample(text)
+
+        verdict = self.classify(sample)
+        if verdict is None:
+            verdict = self.detect(sample) == "en"
+
+        with self.lock:
+            self.verdicts[key] = verdict
+            if len(self.verdicts) > MAX_CACHED_VERDICTS:
+                self.verdicts.popitem(last=False)
+
+        return verdict
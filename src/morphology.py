@@ -0,0 +1,119 @@
+import argparse
+import json
+import logging
+import os
+from functools import lru_cache
+
+import inflect
+
+PATH = os.path.abspath(os.path.dirname(__file__))
+PLURALS_PATH = os.path.join(PATH, "../data/plurals.tsv")
+MAX_COMPUTED_PLURALS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+class Morphology:
+    """
+    Plural forms of words, precomputed for the speller vocabulary
+
+    inflect is slow, so it is only used for words missing from the table
+    and its results are memoized
+    """
+
+    def __init__(self, plurals: dict = None):
+        self.inflect = inflect.engine()
+        self.plurals = plurals if plurals is not None else {}
+        # plural to singular, the first singular is kept if plurals coincide
+        self.singulars = {}
+        for word, plural in self.plurals.items():
+            self.singulars.setdefault(plural, word)
+
+        self.inflect_plural = lru_cache(maxsize=MAX_COMPUTED_PLURALS)(
+            self.inflect.plural
+        )
+
+    def plural(self, word: str) -> str:
+        plural = self.plurals.get(word)
+        if plural is None:
+            plural = self.inflect_plural(word)
+
+        return plural
+
+    def is_plural_pair(self, word: str, known: str) -> bool:
+        """
+        Tell whether one of the words is the plural of the other
+
+        The known word, e.g. a speller suggestion, is looked up in both directions
+        of the table first. The table only knows singulars of the vocabulary,
+        so a miss still compares the memoized plural of the word to the known one
+
+        :param word: str
+        :param known: str
+        :return: bool
+        """
+        if known in self.plurals or known in self.singulars:
+            if self.plurals.get(known) == word or self.singulars.get(known) == word:
+                return True
+
+            # e.g. a singular missing from the vocabulary, or a second singular
+            return self.plural(word) == known
+
+        return self.plural(word) == known or self.plural(known) == word
+
+    @staticmethod
+    def load_plurals(path: str = PLURALS_PATH) -> dict:
+        """
+        Load plurals table, every line holds a word and its plural separated by tab,
+        lines with a single word are regular plurals ending with "s"
+
+        :param path: str
+        :return: dict
+        """
+        plurals = {}
+        if not os.path.exists(path):
+            logger.debug("No plurals table found, plurals will be computed")
+            return plurals
+
+        with open(path) as file:
+            for line in file:
+                word, _, plural = line.rstrip("\n").partition("\t")
+                plurals[word] = plural or f"{word}s"
+
+        return plurals
+
+    def build_plurals(self, words, path: str = PLURALS_PATH) -> int:
+        """
+        Compute plurals of the words and write them as a table
+
+        :param words: iterable of str
+        :param path: str
+        :return: int number of words written
+        """
+        count = 0
+        with open(path, "w") as file:
+            for word in words:
+                # inflect does not handle whitespace well, no need for it anyway
+                if not word or any(char.isspace() for char in word):
+                    continue
+
+                plural = self.inflect.plural(word)
+                file.write(word if plural == f"{word}s" else f"{word}\t{plural}")
+                file.write("\n")
+                count += 1
+
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build plurals table from the speller words data"
+    )
+    parser.add_argument("source", nargs="?", default="data/word_count.json")
+    parser.add_argument("target", nargs="?", default=os.path.normpath(PLURALS_PATH))
+    args = parser.parse_args()
+
+    with open(args.source) as word_file:
+        count = Morphology().build_plurals(json.load(word_file), args.target)
+
+    print(f'{count} plurals written to "{args.target}"')
@@ -0,0 +1,111 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4  # readmes sent to a worker at once
+
+# detector of the current worker process, created once by the pool initializer
+worker_detector = None
+
+
+def init_worker(detector_factory):
+    global worker_detector
+    worker_detector = detector_factory()
+
+
+def get_chunk_verdicts(texts: list) -> tuple:
+    verdicts = worker_detector.get_verdicts_batch(texts)
+
+    # a worker cache is read only, its changes are stored by the parent process
+    changes = None
+    if worker_detector.cache is not None:
+        changes = worker_detector.cache.take_changes()
+
+    return verdicts, changes
+
+
+class ParallelTypoDetector:
+    """
+    Runs typo detection of readme batches in a pool of worker processes
+
+    Each worker builds its own detector with detector_factory once, it has to be
+    a picklable callable (e.g. a module level function) returning a TypoDetector
+
+    Worker detectors may use a read only VerdictCache, the verdicts and hits
+    they collect are then written to the cache of this process, so only one
+    process writes to the cache database
+    """
+
+    def __init__(
+        self,
+        detector_factory,
+        workers: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache=None,
+    ):
+        self.detector_factory = detector_factory
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.executor = None
+
+    @property
+    def min_batch_size(self) -> int:
+        """
+        Smallest batch of texts that keeps all the workers busy
+        """
+        return self.workers * self.chunk_size
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            logger.info(f"Starting {self.workers} typo detector workers")
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(self.detector_factory,),
+            )
+
+        return self.executor
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def get_verdicts_batch(self, texts: list) -> list:
+        """
+        Get verdicts for the words of many texts using all the workers
+
+        :param texts: list
+        :return: list of {word: TypoVerdict} dicts, in the order of texts
+        """
+        chunks = [
+            texts[i : i + self.chunk_size]
+            for i in range(0, len(texts), self.chunk_size)
+        ]
+
+        verdicts_batch = []
+        for chunk_verdicts, changes in self.get_executor().map(
+            get_chunk_verdicts, chunks
+        ):
+            verdicts_batch.extend(chunk_verdicts)
+
+            if changes is not None and self.cache is not None:
+                self.cache.apply_changes(*changes)
+
+        return verdicts_batch
+
+    def get_possible_typos_with_suggestions(self, text: str) -> dict:
+        verdicts = self.get_verdicts_batch([text])[0]
+
+        return {
+            word: verdict.suggestion
+            for word, verdict in verdicts.items()
+            if verdict.is_typo
+        }
@@ -0,0 +1,287 @@
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+import urllib.parse
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HIGH_PRIORITY = 0  # user triggered requests, e.g. approving a typo
+LOW_PRIORITY = 1  # background scanning
+
+# documented limits of an authenticated user: requests per period in seconds
+RESOURCE_LIMITS = {
+    "core": (5000, 3600),
+    "search": (30, 60),
+    "graphql": (5000, 3600),
+}
+RESERVE_FRACTION = 0.1  # part of the budget low priority requests may not use
+BASE_BACKOFF = 60  # seconds to wait after the first secondary rate limit hit
+MAX_BACKOFF = 900
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_SLEEP = 5  # seconds slept at once, so a changed budget is noticed
+
+request_priority = contextvars.ContextVar("request_priority", default=LOW_PRIORITY)
+
+
+@contextlib.contextmanager
+def high_priority():
+    """
+    Let GitHub requests made within the block use the reserved budget
+    """
+    token = request_priority.set(HIGH_PRIORITY)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+def get_resource(url: str) -> str:
+    path = urllib.parse.urlsplit(url).path
+
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class TokenBucket:
+    """
+    Budget of a resource refilled evenly over its period,
+    corrected by the rate limit headers of every response
+    """
+
+    def __init__(self, limit: int, period: float, now: float):
+        self.limit = limit
+        self.period = period
+        self.tokens = float(limit)
+        self.updated_at = now
+        self.reset_at = None
+        self.blocked_until = 0
+        self.backoff_count = 0
+
+    def refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.limit, self.tokens + elapsed * self.limit / self.period)
+        self.updated_at = now
+
+    def get_wait(self, now: float, reserve: float) -> float:
+        """
+        Get seconds to wait until a request can be made
+
+        :param now: float
+        :param reserve: float tokens that have to be left untouched
+        :return: float
+        """
+        self.refill(now)
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        missing = 1 + reserve - self.tokens
+        if missing <= 0:
+            return 0
+
+        return missing * self.period / self.limit
+
+    def update(self, limit: int, remaining: int, reset_at: float, now: float):
+        self.refill(now)
+        self.limit = limit
+        self.tokens = float(remaining)
+        self.reset_at = reset_at
+
+        if remaining <= 0:
+            self.blocked_until = max(self.blocked_until, reset_at)
+
+
+class RateLimiter:
+    """
+    Paces GitHub requests per resource class with token buckets,
+    backs off on secondary rate limits and keeps a reserve
+    of the budget for high priority requests
+    """
+
+    def __init__(self, clock=time.time, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.buckets = {
+            resource: TokenBucket(limit, period, clock())
+            for resource, (limit, period) in RESOURCE_LIMITS.items()
+        }
+
+    def get_bucket(self, resource: str) -> TokenBucket:
+        if resource not in self.buckets:
+            self.buckets[resource] = TokenBucket(*RESOURCE_LIMITS["core"], self.clock())
+
+        return self.buckets[resource]
+
+    def acquire(self, resource: str):
+        """
+        Block until a request to the resource fits the budget, then take it
+
+        :param resource: str
+        :return:
+        """
+        while True:
+            with self.lock:
+                bucket = self.get_bucket(resource)
+                reserve = 0
+                if request_priority.get() != HIGH_PRIORITY:
+                    reserve = bucket.limit * RESERVE_FRACTION
+
+                wait = bucket.get_wait(self.clock(), reserve)
+                if wait <= 0:
+                    bucket.tokens -= 1
+                    return
+
+            logger.debug(f'Waiting {wait:.1f}s for "{resource}" rate limit budget')
+            self.sleep(min(wait, MAX_SLEEP))
+
+    def refund(self, resource: str):
+        """
+        Give back the token of a request the server did not count,
+        e.g. a conditional request answered with 304 Not Modified
+
+        :param resource: str
+        :return:
+        """
+        with self.lock:
+            bucket = self.get_bucket(resource)
+            bucket.tokens = min(bucket.limit, bucket.tokens + 1)
+
+    def update(self, resource: str, headers) -> str:
+        """
+        Sync the budget with X-RateLimit-* response headers
+
+        :param resource: str guessed from url, used when headers do not name it
+        :param headers: response headers
+        :return: str resource the response was counted against
+        """
+        resource = headers.get("X-RateLimit-Resource", resource)
+
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return resource
+
+        with self.lock:
+            self.get_bucket(resource).update(limit, remaining, reset_at, self.clock())
+
+        return resource
+
+    def backoff(self, resource: str, retry_after: float = None) -> float:
+        """
+        Block the resource after a secondary rate limit hit,
+        for the time asked by the server or exponentially longer on every hit
+
+        :param resource: str
+        :param retry_after: float seconds from Retry-After header
+        :return: float seconds the resource is blocked for
+        """
+        with self.lock:
+            bucket = self.get_bucket(resource)
+            bucket.backoff_count += 1
+
+            delay = retry_after
+            if delay is None:
+                delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (bucket.backoff_count - 1))
+            bucket.blocked_until = max(bucket.blocked_until, self.clock() + delay)
+
+        return delay
+
+    def reset_backoff(self, resource: str):
+        with self.lock:
+            self.get_bucket(resource).backoff_count = 0
+
+    def budget(self) -> dict:
+        """
+        Get current budget of every resource, e.g. for metrics
+
+        :return: dict
+        """
+        with self.lock:
+            now = self.clock()
+            budget = {}
+            for resource, bucket in self.buckets.items():
+                bucket.refill(now)
+                budget[resource] = {
+                    "limit": bucket.limit,
+                    "remaining": int(bucket.tokens),
+                    "reset_at": bucket.reset_at,
+                    "blocked_for": max(0.0, bucket.blocked_until - now),
+                }
+
+        return budget
+
+
+def is_rate_limited(response) -> bool:
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+
+    return (
+        "Retry-After" in response.headers
+        or response.headers.get("X-RateLimit-Remaining") == "0"
+        or b"rate limit" in response.content.lower()
+    )
+
+
+def get_retry_after(response):
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Transport adapter making requests through another adapter
+    within the budget of a RateLimiter, rate limited requests are retried
+    """
+
+    def __init__(self, limiter: RateLimiter, adapter: HTTPAdapter = None, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        resource = get_resource(request.url)
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire(resource)
+            response = self.adapter.send(request, **kwargs)
+            if response.status_code == 304 or getattr(response, "from_cache", False):
+                # not counted by GitHub, rate limit headers still take precedence
+                self.limiter.refund(resource)
+            resource = self.limiter.update(resource, response.headers)
+
+            if not is_rate_limited(response):
+                self.limiter.reset_backoff(resource)
+                return response
+
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                # primary limit, the bucket is blocked until the reset time
+                logger.warning(f'Rate limit of "{resource}" exhausted, waiting')
+            else:
+                delay = self.limiter.backoff(resource, get_retry_after(response))
+                logger.warning(
+                    f'Secondary rate limit of "{resource}", retrying in {delay:.0f}s'
+                )
+            response.close()
+
+        return response
+
+    def close(self):
+        self.adapter.close()
+        super().close()
@@ -0,0 +1,49 @@
+import re
+
+from src.readme_tokenizer import get_first_offsets
+
+# words on "\b" boundaries, the same way a typo fix is applied to readme
+WORD_REGEX = re.compile(r"\w+")
+
+
+class ReadmeDocument:
+    """
+    Readme of a repository with an index of word positions,
+    built once and shared by all the possible typos found in it
+    """
+
+    __slots__ = ["text", "positions", "prose_offsets"]
+
+    def __init__(self, text: str):
+        self.text = text
+        self.prose_offsets = None  # first offsets of prose words, built on demand
+
+        self.positions = {}
+        for match in WORD_REGEX.finditer(text):
+            self.positions.setdefault(match.group(), []).append(match.start())
+
+    def get_occurrence_count(self, word: str) -> int:
+        """
+        Count how many times the word occurs in text as a whole word
+
+        :param word: str
+        :return: int
+        """
+        return len(self.positions.get(word, ()))
+
+    def get_first_offset(self, word: str):
+        """
+        Get position of the first occurrence of the word,
+        occurrences in prose are preferred to the ones in code or links
+
+        :param word: str
+        :return: int or None
+        """
+        if self.prose_offsets is None:
+            self.prose_offsets = get_first_offsets(self.text)
+
+        offset = self.prose_offsets.get(word)
+        if offset is None and word in self.positions:
+            offset = self.positions[word][0]
+
+        return offset
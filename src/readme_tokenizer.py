@@ -0,0 +1,48 @@
+import re
+
+# parts of markdown that are not prose and must not be checked for typos
+SKIP_PATTERNS = [
+    r"^[ \t]*```.*?(?:^[ \t]*```[^\n]*$|\Z)",  # fenced code block
+    r"^[ \t]*~~~.*?(?:^[ \t]*~~~[^\n]*$|\Z)",  # fenced code block
+    r"`[^`\n]+`",  # inline code
+    r"<!--.*?-->",  # html comment
+    r"</?[A-Za-z][^>]*>",  # html tag or autolink
+    r"!\[[^\]\n]*\]\([^)\n]*\)",  # image, badges
+    r"\]\([^)\n]*\)",  # link target
+    r"^[ \t]*\[[^\]\n]+\]:[^\n]*$",  # link reference definition
+    r"\b(?:https?|ftp)://\S+",  # bare url
+    r"\bwww\.\S+",  # bare url
+]
+SKIP_REGEX = "|".join(SKIP_PATTERNS)
+
+# whitespace separated lowercase word, same as WORDS_REGEX of TypoDetector
+WORD_REGEX = r"(?<!\S)(?P<word>[a-z]{4,})(?!\S)"
+
+TOKEN_REGEX = re.compile(f"{SKIP_REGEX}|{WORD_REGEX}", re.MULTILINE | re.DOTALL)
+
+
+def tokenize(text: str):
+    """
+    Lazily yield words of readme prose along with their offsets in text,
+    code, links and html are skipped
+
+    :param text: str
+    :return: generator of (word, offset) tuples
+    """
+    for match in TOKEN_REGEX.finditer(text):
+        if match.lastgroup == "word":
+            yield match.group("word"), match.start()
+
+
+def get_first_offsets(text: str) -> dict:
+    """
+    Get offset of the first occurrence of every word in readme prose
+
+    :param text: str
+    :return: dict
+    """
+    offsets = {}
+    for word, offset in tokenize(text):
+        offsets.setdefault(word, offset)
+
+    return offsets
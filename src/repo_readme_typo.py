@@ -1,5 +1,7 @@
 import string
 
+from src.readme_document import ReadmeDocument
+
 MAX_WORDS_COUNT = 2
 STOP_CHARS = [
     ".",
@@ -21,14 +23,103 @@ STOP_CHARS = [
 ]
 
 
+def get_context_bound(text: str, start: int, step: int) -> int:
+    """
+    Walk from start in the step direction over up to MAX_WORDS_COUNT + 1 words,
+    stopping at any of STOP_CHARS
+
+    :param text: str
+    :param start: int
+    :param step: int 1 to walk forward, -1 to walk backward
+    :return: int position where the walk stopped
+    """
+    words_count = 0
+    in_word = False
+
+    # walking backward looks at the character right before the position
+    shift = -1 if step < 0 else 0
+
+    position = start
+    while 0 <= position + shift < len(text):
+        char = text[position + shift]
+        if char in STOP_CHARS:
+            break
+
+        if char in string.whitespace:
+            if words_count > MAX_WORDS_COUNT:
+                break
+            in_word = False
+        elif not in_word:
+            words_count += 1
+            in_word = True
+
+        position += step
+
+    return position
+
+
+def get_context(text: str, word: str, offset: int) -> str:
+    """
+    Get the word at offset with some words around it in text
+
+    :param text: str
+    :param word: str
+    :param offset: int
+    :return: str
+    """
+    # get MAX_WORDS_COUNT words prior to the word in text
+    context_head = text[get_context_bound(text, offset, -1) : offset]
+
+    # get MAX_WORDS_COUNT words after the word in text
+    end = offset + len(word)
+    context_tail = text[end : get_context_bound(text, end, 1)]
+
+    return f"{context_head.strip()} {word} {context_tail.strip()}".strip()
+
+
+def get_typos_with_context(document: ReadmeDocument, words) -> dict:
+    """
+    Get contexts of all the words of readme at once,
+    the word positions are looked up in the document index
+
+    :param document: ReadmeDocument
+    :param words: iterable of str
+    :return: dict {word: context}, a word not found in text is its own context
+    """
+    contexts = {}
+    for word in words:
+        offset = document.get_first_offset(word)
+        contexts[word] = (
+            word if offset is None else get_context(document.text, word, offset)
+        )
+
+    return contexts
+
+
 class RepoReadmeTypo:
     id: int = None
 
-    def __init__(self, repository: str, word: str, suggested: str, readme: str = None):
+    def __init__(
+        self,
+        repository: str,
+        word: str,
+        suggested: str,
+        readme: str = None,
+        document: ReadmeDocument = None,
+        context: str = None,
+    ):
         self.repository = repository
-        self.readme = readme
         self.maybe_typo = word
         self.suggested_word = suggested
+        self.context = context
+
+        if document is None and readme is not None:
+            document = ReadmeDocument(readme)
+        self.document = document
+
+    @property
+    def readme(self) -> str:
+        return self.document.text if self.document else None
 
     def get_typo_with_context(self) -> str:
         """
@@ -36,32 +127,11 @@ class RepoReadmeTypo:
 
         :return: str
         """
-        # get position of the word in text
-        typo_at = self.readme.find(self.maybe_typo)
-
-        # get MAX_WORDS_COUNT words prior to typo-word in text
-        context_head = ""
-        for char in self.readme[:typo_at][::-1]:
-            if char in STOP_CHARS or (
-                char in string.whitespace
-                and len(context_head.split()) > MAX_WORDS_COUNT
-            ):
-                break
-            context_head = char + context_head
-
-        # get MAX_WORDS_COUNT words after the typo-word in text
-        context_tail = ""
-        for char in self.readme[typo_at + len(self.maybe_typo) :]:
-            if char in STOP_CHARS or (
-                char in string.whitespace
-                and len(context_tail.split()) > MAX_WORDS_COUNT
-            ):
-                break
-            context_tail = context_tail + char
+        if self.context is None:
+            contexts = get_typos_with_context(self.document, [self.maybe_typo])
+            self.context = contexts[self.maybe_typo]
 
-        return (
-            f"{context_head.strip()} {self.maybe_typo} {context_tail.strip()}".strip()
-        )
+        return self.context
 
     def get_word_readme_occurrence_count(self) -> int:
         """
@@ -69,4 +139,4 @@ class RepoReadmeTypo:
 
         :return: int
         """
-        return self.readme.count(self.maybe_typo)
+        return self.document.get_occurrence_count(self.maybe_typo)
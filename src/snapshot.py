@@ -0,0 +1,147 @@
+import argparse
+import gc
+import json
+import logging
+import marshal
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+PATH = os.path.abspath(os.path.dirname(__file__))
+SNAPSHOT_PATH = os.path.join(PATH, "../data/startup.snapshot")
+MAGIC = b"PYTYPOS1"
+HEADER_SIZE = struct.Struct("<I")
+SNAPSHOT_VERSION = 1
+
+
+def get_sources_stamp(*paths: str) -> list:
+    """
+    Get size and modification time of the files a snapshot is built from
+
+    :param paths: str
+    :return: list
+    """
+    stamp = []
+    for path in paths:
+        stat = os.stat(path)
+        stamp.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+
+    return stamp
+
+
+class Snapshot:
+    """
+    Speller words data and dictionary serialized into a single binary file,
+    loading it is much faster than parsing the raw data files.
+    Optionally holds the delete index of SymSpeller built with default options
+
+    File layout: magic, header size, marshaled header (version, sources stamp),
+    marshaled data
+    """
+
+    def __init__(self, nlp_data: dict, words: frozenset, deletes: dict = None):
+        self.nlp_data = nlp_data
+        self.words = words
+        self.deletes = deletes
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        word_count_path: str,
+        words_path: str,
+        with_deletes: bool = False,
+    ):
+        with open(word_count_path) as file:
+            nlp_data = json.load(file)
+
+        with open(words_path) as file:
+            words = frozenset(file.read().split())
+
+        deletes = None
+        if with_deletes:
+            from src.sym_speller import SymSpeller
+
+            deletes = SymSpeller(nlp_data).deletes
+
+        header = {
+            "version": SNAPSHOT_VERSION,
+            "sources": get_sources_stamp(word_count_path, words_path),
+        }
+        data = {"nlp_data": nlp_data, "words": words, "deletes": deletes}
+
+        # write to a temporary file first, a crash must not leave a broken snapshot
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            header_bytes = marshal.dumps(header)
+            file.write(MAGIC)
+            file.write(HEADER_SIZE.pack(len(header_bytes)))
+            file.write(header_bytes)
+            marshal.dump(data, file)
+        os.replace(tmp_path, path)
+
+        return cls(nlp_data, words, deletes)
+
+    @classmethod
+    def load(cls, path: str, word_count_path: str, words_path: str):
+        """
+        Load snapshot if it exists and was built from the current data files
+
+        :param path: str
+        :param word_count_path: str
+        :param words_path: str
+        :return: Snapshot or None
+        """
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                logger.warning(f'"{path}" is not a snapshot file, ignoring')
+                return None
+
+            (header_size,) = HEADER_SIZE.unpack(file.read(HEADER_SIZE.size))
+            header = marshal.loads(file.read(header_size))
+            if header.get("version") != SNAPSHOT_VERSION:
+                logger.info("Snapshot version is outdated, ignoring")
+                return None
+
+            sources = [tuple(source) for source in header["sources"]]
+            try:
+                is_stale = sources != get_sources_stamp(word_count_path, words_path)
+            except FileNotFoundError:
+                is_stale = True
+
+            if is_stale:
+                logger.info("Snapshot is older than the data files, ignoring")
+                return None
+
+            # marshal reads from a file object in small chunks, loading bytes is faster
+            data_bytes = file.read()
+
+        # nothing to collect among the freshly loaded objects
+        gc.disable()
+        try:
+            data = marshal.loads(data_bytes)
+        finally:
+            gc.enable()
+
+        return cls(data["nlp_data"], data["words"], data["deletes"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build startup snapshot of the speller data and dictionary"
+    )
+    parser.add_argument("--word-count", default="data/word_count.json")
+    parser.add_argument("--words", default="data/words_alpha.txt")
+    parser.add_argument("--target", default=os.path.normpath(SNAPSHOT_PATH))
+    parser.add_argument(
+        "--symspell", action="store_true", help="include SymSpeller delete index"
+    )
+    args = parser.parse_args()
+
+    Snapshot.build(args.target, args.word_count, args.words, args.symspell)
+
+    print(f'Snapshot written to "{args.target}"')
@@ -0,0 +1,164 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+INDEXED_WORDS_REGEX = re.compile("^[a-z]+$")
+
+
+def get_deletes(word: str, max_distance: int) -> set:
+    """
+    Get all strings made from the word by deleting up to max_distance characters
+
+    :param word: str
+    :param max_distance: int
+    :return: set
+    """
+    deletes = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            item[:i] + item[i + 1 :] for item in frontier for i in range(len(item))
+        }
+        deletes |= frontier
+
+    return deletes
+
+
+def get_edit_distance(word_1: str, word_2: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein with adjacent transpositions),
+    returns max_distance + 1 as soon as the distance is known to exceed max_distance
+
+    :param word_1: str
+    :param word_2: str
+    :param max_distance: int
+    :return: int
+    """
+    if abs(len(word_1) - len(word_2)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(word_2) + 1))
+    for i in range(1, len(word_1) + 1):
+        current = [i] + [0] * len(word_2)
+        for j in range(1, len(word_2) + 1):
+            cost = word_1[i - 1] != word_2[j - 1]
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if (
+                i > 1
+                and j > 1
+                and word_1[i - 1] == word_2[j - 2]
+                and word_1[i - 2] == word_2[j - 1]
+            ):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1]
+
+
+class SymSpeller:
+    """
+    Drop-in replacement of autocorrect.Speller built on symmetric delete index
+
+    Deletes of every vocabulary word are computed once, so looking up corrections
+    takes a few dict probes instead of generating all edits of the word.
+    Corrections are ranked as in autocorrect.Speller: the smallest edit distance
+    wins, ties are resolved by the word frequency
+    """
+
+    def __init__(
+        self,
+        nlp_data: dict,
+        max_distance: int = MAX_EDIT_DISTANCE,
+        prefix_length: int = PREFIX_LENGTH,
+        deletes: dict = None,
+    ):
+        self.nlp_data = nlp_data
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        # prebuilt index (e.g. from startup snapshot) must match the options above
+        self.deletes = deletes if deletes is not None else self.build_deletes()
+
+    def build_deletes(self) -> dict:
+        # delete -> word or list of words, single words are not wrapped to save memory
+        deletes = {}
+        for word in self.nlp_data:
+            # autocorrect.Speller only produces lowercase latin edits
+            if INDEXED_WORDS_REGEX.match(word) is None:
+                continue
+
+            for delete in get_deletes(word[: self.prefix_length], self.max_distance):
+                words = deletes.get(delete)
+                if words is None:
+                    deletes[delete] = word
+                elif isinstance(words, str):
+                    deletes[delete] = [words, word]
+                else:
+                    words.append(word)
+
+        logger.debug(f"Built symmetric delete index of {len(deletes)} entries")
+
+        return deletes
+
+    def get_candidates(self, word: str) -> list:
+        if word in self.nlp_data:
+            return [(self.nlp_data[word], word)]
+
+        suggestions = set()
+        for delete in get_deletes(word[: self.prefix_length], self.max_distance):
+            words = self.deletes.get(delete)
+            if words is None:
+                continue
+            if isinstance(words, str):
+                suggestions.add(words)
+            else:
+                suggestions.update(words)
+
+        best_distance = self.max_distance + 1
+        candidates = []
+        for suggestion in suggestions:
+            # candidates farther than the best one so far are not interesting
+            limit = min(best_distance, self.max_distance)
+            distance = get_edit_distance(word, suggestion, limit)
+            if distance > limit:
+                continue
+            if distance < best_distance:
+                best_distance = distance
+                candidates = [suggestion]
+            elif distance == best_distance:
+                candidates.append(suggestion)
+
+        return [(self.nlp_data[c], c) for c in candidates] or [(0, word)]
+
+    def autocorrect_word(self, word: str) -> str:
+        """
+        Most likely correction of the word, up to max_distance edits
+
+        :param word: str
+        :return: str
+        """
+        if word == "":
+            return ""
+
+        candidates = self.get_candidates(word)
+
+        # in case the word is capitalized
+        if word[0].isupper():
+            decapitalized = word[0].lower() + word[1:]
+            candidates += self.get_candidates(decapitalized)
+
+        best_word = max(candidates)[1]
+
+        if word[0].isupper():
+            best_word = best_word[0].upper() + best_word[1:]
+
+        return best_word
@@ -1,17 +1,22 @@
 import datetime
 import logging
 import re
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 from github3.exceptions import NotFoundError, UnavailableForLegalReasons
 from github3.pulls import PullRequest
 from github3.repos.repo import Repository
 
 from src.action import Action
+from src.count_min_sketch import DEFAULT_WIDTH, CountMinSketch
 from src.database import TinyDBProvider
-from src.github_client import TYPO_BRANCH_NAME, GithubClient
+from src.github_client import GRAPHQL_PAGE_SIZE, GithubClient
 from src.language_detector import LanguageDetector
-from src.repo_readme_typo import RepoReadmeTypo
+from src.rate_limiter import high_priority
+from src.readme_document import ReadmeDocument
+from src.repo_readme_typo import RepoReadmeTypo, get_typos_with_context
 from src.typo_detector import MAX_TYPO_OCCURRENCES, TypoDetector
 
 logger = logging.getLogger(__name__)
@@ -19,6 +24,15 @@ logger = logging.getLogger(__name__)
 MIN_REPO_STARS = 30  # minimum amount of stargazers of the repo to be checked for typos
 DAYS_TO_LOOK_BACK = 7
 MIN_OCCURRENCE_COUNT_TO_IGNORE = 50
+# the sketch is halved at this total, which keeps the overcount of a word
+# around a tenth of the ignore threshold and well below it in every row
+WORD_SKETCH_MAX_TOTAL = DEFAULT_WIDTH * MIN_OCCURRENCE_COUNT_TO_IGNORE // 10
+WORD_SKETCH_SAVE_INTERVAL = 5 * 60  # seconds
+
+FORK_CLEANUP_CURSOR = "fork_cleanup_cursor"  # closed time of the last swept PR
+CURSOR_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+FORK_DELETION_WORKERS = 4
+FORK_DELETION_CHUNK_SIZE = 20
 
 
 class TypoClient:
@@ -30,33 +44,113 @@ class TypoClient:
         github: GithubClient,
         database: TinyDBProvider,
         typo_detector: TypoDetector,
+        readme_batch_size: int = 1,
+        search_window_days: int = 1,
+        word_sketch_path: str = None,
     ):
         self.github = github
         self.database = database
         self.typo_detector = typo_detector
-        self.counter = Counter()
+        self.readme_batch_size = readme_batch_size
+        self.search_window_days = search_window_days
+
+        # occurrences of possible typos across all checked readmes
+        self.word_sketch_path = word_sketch_path
+        self.word_sketch = (
+            CountMinSketch.load(word_sketch_path, max_total=WORD_SKETCH_MAX_TOTAL)
+            if word_sketch_path
+            else CountMinSketch(max_total=WORD_SKETCH_MAX_TOTAL)
+        )
+        self.word_sketch_saved_at = time.monotonic()
         self.language_detector = LanguageDetector()
 
         self.reset_generator()
         self.reset_look_date()
 
     def get_repo_typo(self, date):
-        repositories = self.github.get_most_starred_repos_for_date(date)
+        for batch in self.get_readme_batches(date):
+            verdicts_batch = self.typo_detector.get_verdicts_batch(
+                [readme for _, readme in batch]
+            )
+
+            for (repository, readme), verdicts in zip(batch, verdicts_batch):
+                yield from self.get_readme_typo(repository, readme, verdicts)
+
+    def get_readme_batches(self, date):
+        """
+        Collect readmes of the repos worth checking in batches of readme_batch_size,
+        so they can be checked for typos at once
+
+        :param date: str
+        :return: generator of lists of (Repository, readme) tuples
+        """
+        batch = []
+        for repository, readme in self.get_repos_with_readme(date):
+            batch.append((repository, readme))
+
+            if len(batch) >= self.readme_batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def get_repos_to_check(self, date):
+        """
+        Search repos created within the window of search_window_days ending on date,
+        stars requirement is checked by the search itself
+
+        :param date: str last day of the window
+        :return: generator of Repository
+        """
+        end = datetime.date.fromisoformat(date)
+        start = end - datetime.timedelta(days=self.search_window_days - 1)
+
+        repositories = self.github.get_most_starred_repos_for_window(
+            start, end, min_stars=MIN_REPO_STARS
+        )
 
         for repo in repositories:
-            repository: Repository = repo.repository
+            yield repo.repository
 
-            if repository.stargazers_count < MIN_REPO_STARS:
-                logger.debug(f"Repo does not meet min stars requirement, skipping")
-                break  # repos are sorted desc by stars so there is no point looking further
+    def get_repos_with_readme(self, date):
+        """
+        Fetch readmes of the repos worth checking a page at a time,
+        with a single GraphQL query per page
+
+        :param date: str
+        :return: generator of (Repository, readme) tuples
+        """
+        page = []
+        for repository in self.get_repos_to_check(date):
+            page.append(repository)
 
-            if self.database.is_already_approved_repo(repository.full_name):
+            if len(page) >= GRAPHQL_PAGE_SIZE:
+                yield from self.get_page_readmes(page)
+                page = []
+
+        if page:
+            yield from self.get_page_readmes(page)
+
+    def get_page_readmes(self, repositories: list):
+        not_approved = self.database.filter_not_approved(
+            [repository.full_name for repository in repositories]
+        )
+        details = self.github.get_repositories_details(not_approved)
+
+        for repository in repositories:
+            if repository.full_name not in not_approved:
                 logger.debug(
                     f'Already had PR in "{repository.full_name}" repo, skipping'
                 )
                 continue
 
-            readme = self.github.get_repository_readme(repository)
+            repository_details = details.get(repository.full_name)
+            readme = repository_details.readme if repository_details else None
+
+            if readme is None:
+                # readme of other name or location, e.g. docs/README.md
+                readme = self.github.get_repository_readme(repository)
 
             if readme == "":
                 logger.debug("Readme is empty, skipping")
@@ -66,81 +160,119 @@ class TypoClient:
                 logger.debug("Readme is not in English, skipping")
                 continue
 
-            suggestions = self.typo_detector.get_possible_typos_with_suggestions(readme)
+            yield repository, readme
+
+    def get_readme_typo(self, repository: Repository, readme: str, verdicts: dict):
+        suggestions = {
+            word: verdict.suggestion
+            for word, verdict in verdicts.items()
+            if verdict.is_typo
+        }
+        document = ReadmeDocument(readme) if suggestions else None
+
+        # skip if the "typo" word is in repo name
+        candidates = []
+        for maybe_typo in suggestions:
+            if maybe_typo.lower() in repository.full_name.lower():
+                logger.debug('Repo name contains the word "%s"', maybe_typo)
+            else:
+                candidates.append(maybe_typo)
+
+        # the whole readme costs a single database lookup and insert
+        not_ignored = self.database.filter_not_ignored(candidates) if candidates else []
+        logger.debug(f"{len(candidates) - len(not_ignored)} words are in ignore list")
+
+        if not_ignored:
+            self.count_words(document, not_ignored)
+
+        too_frequent = {
+            maybe_typo
+            for maybe_typo in not_ignored
+            if self.word_sketch.estimate(maybe_typo.lower())
+            >= MIN_OCCURRENCE_COUNT_TO_IGNORE
+        }
+        if too_frequent:
+            logger.info(
+                f"Too many occurrences of words {sorted(too_frequent)} in total, "
+                f"adding to ignore list"
+            )
+            self.database.add_many_to_ignored(sorted(too_frequent))
+
+        # contexts of all the possible typos of the readme in one go
+        contexts = get_typos_with_context(
+            document, [word for word in not_ignored if word not in too_frequent]
+        )
 
-            for maybe_typo, suggestion in suggestions.items():
-                # skip if the "typo" word is in repo name
-                if maybe_typo.lower() in repository.full_name.lower():
-                    logger.debug('Repo name contains the word "%s"', maybe_typo)
-                    continue
+        for maybe_typo, context in contexts.items():
+            suggestion = suggestions[maybe_typo]
 
-                if self.database.is_ignored(maybe_typo):
-                    logger.debug('"%s" is in ignore list', maybe_typo)
-                    continue
+            typo = RepoReadmeTypo(
+                repository=repository.full_name,
+                document=document,
+                word=maybe_typo,
+                suggested=suggestion,
+                context=context,
+            )
 
-                if self.check_counter(maybe_typo, readme):
-                    logger.info(
-                        f'Too many occurrences of word "{maybe_typo}" in total - '
-                        f"{self.counter.get(maybe_typo.lower())}, adding to ignore list"
-                    )
-                    self.add_to_ignored(maybe_typo)
-                    continue
-
-                typo = RepoReadmeTypo(
-                    repository=repository.full_name,
-                    readme=readme,
-                    word=maybe_typo,
-                    suggested=suggestion,
+            occurrence_count = typo.get_word_readme_occurrence_count()
+            if occurrence_count > MAX_TYPO_OCCURRENCES:
+                logger.debug(
+                    f'Too many occurrences of possible typo "{maybe_typo}" '
+                    f"in text - {occurrence_count}, skipping"
                 )
+                continue
 
-                if typo.get_word_readme_occurrence_count() > MAX_TYPO_OCCURRENCES:
-                    logger.debug(
-                        f'Too many occurrences of possible typo "{maybe_typo}" '
-                        f"in text - {readme.count(maybe_typo)}, skipping"
-                    )
-                    continue
-
-                if not self.language_detector.is_english(typo.get_typo_with_context()):
-                    logger.debug("Typo context is not in English, skipping")
-                    continue
+            if not self.language_detector.is_english(typo.get_typo_with_context()):
+                logger.debug("Typo context is not in English, skipping")
+                continue
 
-                if len(repository.full_name + maybe_typo + suggestion) > 54:  # fixme
-                    logger.debug(f'Repo name "{repository.full_name}" is too long')
-                    break
+            if len(repository.full_name + maybe_typo + suggestion) > 54:  # fixme
+                logger.debug(f'Repo name "{repository.full_name}" is too long')
+                break
 
-                action = yield typo
+            action = yield typo
 
-                if action in [Action.SKIP_REPO, Action.APPROVE_REPO]:
-                    break
+            if action in [Action.SKIP_REPO, Action.APPROVE_REPO]:
+                break
 
-    def check_counter(self, word: str, readme: str) -> bool:
+    def count_words(self, document: ReadmeDocument, words: list):
         """
-        Keep track of most frequent words across all repos
+        Keep track of most frequent possible typos across all repos
 
-        :param word: str
-        :param readme: str
-        :return: bool
+        :param document: ReadmeDocument
+        :param words: list of possible typos found in the document
+        :return:
         """
-        word_lower = word.lower()
+        wanted = {word.lower() for word in words}
+
+        counts = Counter()
+        for word, positions in document.positions.items():
+            word_lower = word.lower()
+            if word_lower in wanted:
+                counts[word_lower] += len(positions)
 
-        self.counter.update([word_lower] * readme.lower().count(word_lower))
+        self.word_sketch.update(counts)
 
-        can_ignore = self.counter.get(word_lower) >= MIN_OCCURRENCE_COUNT_TO_IGNORE
+        if time.monotonic() - self.word_sketch_saved_at >= WORD_SKETCH_SAVE_INTERVAL:
+            self.save_word_sketch()
 
-        if can_ignore:
-            self.counter.pop(word_lower)
+    def save_word_sketch(self):
+        self.word_sketch_saved_at = time.monotonic()
 
-        return can_ignore
+        if self.word_sketch_path:
+            self.word_sketch.save(self.word_sketch_path)
+            logger.debug(f'Word sketch saved to "{self.word_sketch_path}"')
 
     def create_pull_request_with_fix(self, typo: RepoReadmeTypo) -> PullRequest:
-        readme = self.github.get_repository_readme(typo.repository)
-        modified_readme = re.sub(
-            r"\b%s\b" % typo.maybe_typo, typo.suggested_word, readme
-        )
+        with high_priority():
+            readme = self.github.get_repository_readme(typo.repository)
+            modified_readme = re.sub(
+                r"\b%s\b" % typo.maybe_typo, typo.suggested_word, readme
+            )
 
-        return self.github.create_fix_typo_pull_request(
-            typo.repository, modified_readme=modified_readme
-        )
+            return self.github.create_fix_typo_pull_request(
+                typo.repository, modified_readme=modified_readme
+            )
 
     def reset_generator(self):
         self.repo_generator = None
@@ -157,14 +289,15 @@ class TypoClient:
         self.repo_generator = self.get_repo_typo(self.get_date())
 
     def delete_fork_repository(self, repository: str) -> bool:
-        return self.github.delete_fork_repository(repository)
+        with high_priority():
+            return self.github.delete_fork_repository(repository)
 
     def get_date(self) -> str:
         return self.look_date.strftime("%Y-%m-%d")
 
-    def lower_look_date(self, offset=1):
+    def lower_look_date(self, offset: int = None):
         self.reset_generator()
-        self.look_date -= datetime.timedelta(days=offset)
+        self.look_date -= datetime.timedelta(days=offset or self.search_window_days)
 
     def add_to_ignored(self, word: str):
         return self.database.add_to_ignored(word)
@@ -175,27 +308,94 @@ class TypoClient:
         )
 
     def delete_forks_with_closed_pull_requests(self):
-        public_repos = self.github.get_my_public_repositories()
+        """
+        Delete forks whose typo fix pull requests were closed since the last sweep,
+        found with a single search and deleted concurrently
 
-        pull_request_head = "{}:{}".format(self.github.get_me(), TYPO_BRANCH_NAME)
+        The sweep cursor is saved after every chunk of deletions,
+        so an interrupted sweep resumes where it stopped
 
-        for repo in public_repos:
-            if not repo.fork:
+        :return:
+        """
+        cursor = self.database.get_state(FORK_CLEANUP_CURSOR)
+
+        # a fork reused for a new pull request is still needed
+        open_repos = {
+            name.lower() for name, _, _ in self.github.get_my_typo_pull_requests("open")
+        }
+
+        # the latest closed pull request of every repo
+        closed = {}
+        for name, closed_at, number in self.github.get_my_typo_pull_requests(
+            "closed", closed_since=cursor
+        ):
+            name = name.lower()
+            if name in open_repos:
                 continue
-            logger.debug(f'Checking "{repo}" for deletion')
+            if name not in closed or closed_at >= closed[name][0]:
+                closed[name] = (closed_at, number)
+
+        candidates = [
+            (name, closed_at, number)
+            for name, (closed_at, number) in sorted(
+                closed.items(), key=lambda item: item[1][0]
+            )
+        ]
+        logger.info(f"{len(candidates)} forks to delete since {cursor}")
+
+        failed_at = None
+        with ThreadPoolExecutor(max_workers=FORK_DELETION_WORKERS) as executor:
+            for start in range(0, len(candidates), FORK_DELETION_CHUNK_SIZE):
+                chunk = candidates[start : start + FORK_DELETION_CHUNK_SIZE]
+                deleted = executor.map(
+                    self.delete_closed_fork,
+                    [name for name, _, _ in chunk],
+                    [number for _, _, number in chunk],
+                )
 
-            try:
-                repo = repo.refresh()  # get full repo details
-                parent_repo = repo.parent
+                failures = [
+                    closed_at
+                    for (_, closed_at, _), is_deleted in zip(chunk, deleted)
+                    if not is_deleted
+                ]
+
+                # failed deletions are retried on the next sweep
+                if failed_at is None:
+                    failed_at = min(failures, default=None)
+                    self.database.set_state(
+                        FORK_CLEANUP_CURSOR,
+                        (failed_at or chunk[-1][1]).strftime(CURSOR_FORMAT),
+                    )
 
-                my_pull_requests = parent_repo.pull_requests(
-                    state="closed", number=1, head=pull_request_head
-                )
-                for _ in my_pull_requests:
-                    # PR was closed, we can delete our fork now
-                    if self.github.delete_repository(repo):
-                        logger.info(f'"{repo}" has been successfully deleted')
-                    else:
-                        logger.warning(f'Failed to delete fork "{repo}"')
-            except (UnavailableForLegalReasons, NotFoundError) as e:
-                logger.warning(f'Error "{e}" occurred during deletion of "{repo}"')
+    def delete_closed_fork(self, repository: str, number: int) -> bool:
+        """
+        Delete fork of the repository the pull request was opened from,
+        the fork is found from the pull request as it may be named differently
+
+        :param repository: str parent repository name
+        :param number: int pull request number
+        :return: bool whether the fork is gone
+        """
+        fork_name = f"head of {repository}#{number}"
+
+        try:
+            fork = self.github.get_pull_request_head_repository(repository, number)
+            if fork is None:
+                return True  # already deleted
+
+            fork_name = fork.full_name
+            if not fork.fork or fork.parent.full_name.lower() != repository:
+                logger.warning(f'"{fork_name}" is not a fork of "{repository}"')
+                return True
+
+            if self.github.delete_repository(fork):
+                logger.info(f'"{fork_name}" has been successfully deleted')
+                return True
+
+            logger.warning(f'Failed to delete fork "{fork_name}"')
+        except NotFoundError:
+            return True  # already deleted
+        except UnavailableForLegalReasons as e:
+            logger.warning(f'Error "{e}" occurred during deletion of "{fork_name}"')
+
+        return False
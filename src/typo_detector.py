@@ -1,88 +1,160 @@
 import logging
 import os
-import re
+from typing import NamedTuple, Optional
 
-import inflect
 from autocorrect import Speller
 
+from src.compact_dictionary import CompactDictionary
+from src.morphology import Morphology
+from src.readme_tokenizer import tokenize
+
 MAX_TYPO_OCCURRENCES = 2
 WORDS_REGEX = "^[a-z]{4,}$"
 PATH = os.path.abspath(os.path.dirname(__file__))
+WORDS_PATH = os.path.join(PATH, "../data/words_alpha.txt")
+WORDS_COMPACT_PATH = os.path.join(PATH, "../data/words_alpha.dict")
 
 logger = logging.getLogger(__name__)
 
 
+class Reason:
+    DICTIONARY = "dictionary"
+    NO_SUGGESTION = "no-suggestion"
+    NOT_COMMON_TYPO = "not-common-typo"
+
+    PLURAL = "plural"
+    PREFIX_UN = "prefix-un"
+    PREFIX_RE = "prefix-re"
+    PREFIX_DE = "prefix-de"
+    PREFIX_IN = "prefix-in"
+    SUFFIX_LY = "suffix-ly"
+    SUFFIX_D = "suffix-d"
+
+
+# (prefix, suffix, reason) - a word is not a typo if it differs from the suggested
+# word only by the prefix and suffix, or the other way around
+AFFIX_RULES = [
+    ("un", "", Reason.PREFIX_UN),  # set - unset
+    ("re", "", Reason.PREFIX_RE),  # placed - replaced
+    ("de", "", Reason.PREFIX_DE),  # compress - decompress
+    ("in", "", Reason.PREFIX_IN),  # complete - incomplete
+    ("", "ly", Reason.SUFFIX_LY),  # strong - strongly
+    ("", "d", Reason.SUFFIX_D),  # force - forced
+]
+
+
+class TypoVerdict(NamedTuple):
+    word: str
+    suggestion: Optional[str]
+    reason: Optional[str] = None  # why the word was rejected, None for a possible typo
+
+    @property
+    def is_typo(self) -> bool:
+        return self.reason is None
+
+
 class TypoDetector:
-    def __init__(self, speller=None):
-        self.inflect = inflect.engine()
+    def __init__(self, speller=None, cache=None, words=None):
         self.speller = speller if speller else Speller()
+        self.morphology = Morphology(Morphology.load_plurals())
+        self.cache = cache
 
-        self.words = self.load_words()
+        self.words = words if words is not None else self.load_words()
 
     @staticmethod
     def load_words():
-        with open(os.path.join(PATH, f"../data/words_alpha.txt")) as word_file:
+        # prebuilt with "python -m src.compact_dictionary"
+        if CompactDictionary.is_fresh(WORDS_COMPACT_PATH, WORDS_PATH):
+            return CompactDictionary(WORDS_COMPACT_PATH)
+
+        with open(WORDS_PATH) as word_file:
             valid_words = set(word_file.read().split())
 
         return valid_words
 
     @staticmethod
     def get_unique_words(text: str) -> list:
-        return list(
-            set(filter(lambda w: re.search(WORDS_REGEX, w) is not None, text.split()))
-        )
+        return list({word for word, _ in tokenize(text)})
 
-    def is_possible_typo(self, word: str) -> bool:
+    def get_verdict(self, word: str) -> TypoVerdict:
+        """
+        Check the word and tell whether it is a possible typo, and if not - why
+
+        :param word: str
+        :return: TypoVerdict
+        """
         if word in self.words:
-            return False
+            return TypoVerdict(word, None, Reason.DICTIONARY)
 
-        autocorrected_word = self.speller.autocorrect_word(word)
+        if self.cache is None:
+            return self.check_word(word)
 
-        def variant(word_1, word_2, prefix="", suffix=""):
-            return (
-                f"{prefix}{word_1}{suffix}".lower() == word_2.lower()
-                or f"{prefix}{word_2}{suffix}".lower() == word_1.lower()
-            )
+        verdict = self.cache.get(word)
+        if verdict is None:
+            verdict = self.check_word(word)
+            self.cache.put(verdict)
 
-        # story - stories
-        if (
-            self.inflect.plural(word) == autocorrected_word
-            or self.inflect.plural(autocorrected_word) == word
-        ):
-            return False
+        return verdict
 
-        # set - unset
-        if variant(word, autocorrected_word, prefix="un"):
-            return False
+    def check_word(self, word: str) -> TypoVerdict:
+        autocorrected_word = self.speller.autocorrect_word(word)
 
-        # placed - replaced
-        if variant(word, autocorrected_word, prefix="re"):
-            return False
+        reason = self.get_inflection_reason(word, autocorrected_word)
+        if reason is None and word == autocorrected_word:
+            reason = Reason.NO_SUGGESTION
 
-        # compress - decompress
-        if variant(word, autocorrected_word, prefix="de"):
-            return False
+        return TypoVerdict(word, autocorrected_word, reason)
 
-        # complete - incomplete
-        if variant(word, autocorrected_word, prefix="in"):
-            return False
+    def get_inflection_reason(self, word: str, suggested: str) -> Optional[str]:
+        """
+        Tell whether the word is just an inflection of the suggested word
 
-        # strong - strongly
-        if variant(word, autocorrected_word, suffix="ly"):
-            return False
+        :param word: str
+        :param suggested: str
+        :return: str rejection reason or None
+        """
+        # story - stories
+        if self.morphology.is_plural_pair(word, suggested):
+            return Reason.PLURAL
 
-        # force - forced
-        if variant(word, autocorrected_word, suffix="d"):
-            return False
+        word, suggested = word.lower(), suggested.lower()
+        for prefix, suffix, reason in AFFIX_RULES:
+            if (
+                f"{prefix}{word}{suffix}" == suggested
+                or f"{prefix}{suggested}{suffix}" == word
+            ):
+                return reason
 
-        return word != autocorrected_word
+        return None
+
+    def is_possible_typo(self, word: str) -> bool:
+        return self.get_verdict(word).is_typo
 
     def get_possible_typos_with_suggestions(self, text: str) -> dict:
         words = self.get_unique_words(text)
 
         possible_typos = {}
         for word in words:
-            if self.is_possible_typo(word):
-                possible_typos[word] = self.speller.autocorrect_word(word)
+            verdict = self.get_verdict(word)
+            if verdict.is_typo:
+                possible_typos[word] = verdict.suggestion
 
         return possible_typos
+
+    def get_verdicts_batch(self, texts: list) -> list:
+        """
+        Get verdicts for the words of many texts at once,
+        every distinct word across the whole batch is checked only once
+
+        :param texts: list
+        :return: list of {word: TypoVerdict} dicts, one per text
+        """
+        texts_words = [self.get_unique_words(text) for text in texts]
+
+        verdicts = {}
+        for words in texts_words:
+            for word in words:
+                if word not in verdicts:
+                    verdicts[word] = self.get_verdict(word)
+
+        return [{word: verdicts[word] for word in words} for words in texts_words]
@@ -1,33 +1,134 @@
 import logging
 import os
+import re
 
-from .typo_detector import TypoDetector
+from .readme_tokenizer import SKIP_REGEX
+from .typo_detector import WORDS_REGEX, Reason, TypoDetector, TypoVerdict
 
 PATH = os.path.abspath(os.path.dirname(__file__))
+TYPOS_PATH = os.path.join(PATH, "../data/common_typos.txt")
 
 logger = logging.getLogger(__name__)
 
 
+def build_trie_pattern(words) -> str:
+    """
+    Build regex pattern matching any of the words, shaped as a trie
+    so the regex engine never has to try the words one by one
+
+    :param words: iterable of str
+    :return: str
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of word
+
+    def to_pattern(node: dict) -> str:
+        branches = [
+            re.escape(char) + to_pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+
+        is_word_end = "" in node
+        if len(branches) == 1 and not is_word_end:
+            return branches[0]
+
+        pattern = "(?:{})".format("|".join(branches))
+        return f"{pattern}?" if is_word_end else pattern
+
+    # never matching pattern for an empty list
+    return to_pattern(trie) or "(?!)"
+
+
 class TypoDetectorDict(TypoDetector):
+    """
+    Looks for well known typos from the list, which is compiled into a single regex
+    and recompiled only when the list file changes
+    """
+
+    # compiled typos are shared by all instances, since a new one is created daily
+    common_typos = {}
+    typos_regex = None
+    typos_mtime = None
+
+    def __init__(self, typos_path: str = TYPOS_PATH):
+        # speller and dictionary of TypoDetector are not needed here
+        self.typos_path = typos_path
+        self.cache = None
+
     @staticmethod
-    def load_typos():
+    def load_typos(path: str = TYPOS_PATH):
         typos = {}
-        with open(os.path.join(PATH, "../data/common_typos.txt")) as word_file:
+        with open(path) as word_file:
             for line in word_file:
-                if len(line.strip().split(':')) == 2:
-                    typo, correct = line.strip().split(':')
+                if len(line.strip().split(":")) == 2:
+                    typo, correct = line.strip().split(":")
                     typos[typo.strip()] = correct.strip()
 
         return typos
 
-    def get_possible_typos_with_suggestions(self, text: str) -> dict:
-        common_typos = self.load_typos()
+    def get_typos_regex(self):
+        mtime = os.stat(self.typos_path).st_mtime_ns
+        cls = type(self)
+
+        if cls.typos_regex is None or cls.typos_mtime != (self.typos_path, mtime):
+            logger.info(f'Compiling typos from "{self.typos_path}"')
+            common_typos = {
+                typo: correct
+                for typo, correct in self.load_typos(self.typos_path).items()
+                if typo != correct
+            }
+
+            # typos are matched with the word boundaries and shape of the tokenizer,
+            # so the regex finds exactly the words a lookup of tokens would find
+            cls.typos_regex = re.compile(
+                r"{}|(?<!\S)(?P<typo>{})(?!\S)".format(
+                    SKIP_REGEX,
+                    build_trie_pattern(
+                        typo for typo in common_typos if re.match(WORDS_REGEX, typo)
+                    ),
+                ),
+                re.MULTILINE | re.DOTALL,
+            )
+            cls.common_typos = common_typos
+            cls.typos_mtime = (self.typos_path, mtime)
+
+        return cls.typos_regex
+
+    def get_verdict(self, word: str) -> TypoVerdict:
+        self.get_typos_regex()
 
-        words = self.get_unique_words(text)
+        if word in self.common_typos:
+            return TypoVerdict(word, self.common_typos[word])
+
+        return TypoVerdict(word, None, Reason.NOT_COMMON_TYPO)
+
+    def get_possible_typos_with_suggestions(self, text: str) -> dict:
+        typos_regex = self.get_typos_regex()
 
         possible_typos = {}
-        for word in words:
-            if word in common_typos and word != common_typos[word]:
-                possible_typos[word] = common_typos[word]
+        for match in typos_regex.finditer(text):
+            if match.lastgroup == "typo":
+                typo = match.group("typo")
+                possible_typos[typo] = self.common_typos[typo]
 
         return possible_typos
+
+    def get_verdicts_batch(self, texts: list) -> list:
+        verdicts_batch = []
+        for text in texts:
+            suggestions = self.get_possible_typos_with_suggestions(text)
+            verdicts_batch.append(
+                {
+                    typo: TypoVerdict(typo, correct)
+                    for typo, correct in suggestions.items()
+                }
+            )
+
+        return verdicts_batch
@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+from src.typo_detector import TypoVerdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 500_000
+EVICT_FRACTION = 0.1  # part of the entries dropped at once when the cache is full
+USES_FLUSH_SIZE = 1000  # recency updates of hits written at once
+
+
+def fingerprint_files(*paths: str) -> str:
+    """
+    Build a fingerprint of files from their size and modification time,
+    used to tell whether the data changed without reading it on every start
+
+    A missing file, e.g. a word list replaced by its compact dictionary,
+    is fingerprinted as missing, so the fingerprint changes once it appears
+
+    :param paths: str
+    :return: str
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except FileNotFoundError:
+            logger.warning(f'No "{path}" to fingerprint, it is left out')
+            state = "missing"
+
+        digest.update(f"{os.path.basename(path)}:{state};".encode())
+
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """
+    Persistent word-to-verdict cache for TypoDetector backed by SQLite
+
+    The cache is bound to a fingerprint of the data the verdicts were made with,
+    once the fingerprint changes all the stored verdicts are dropped
+
+    A read only cache, e.g. of a worker process, never writes to the database:
+    new verdicts and hits are collected until take_changes() hands them over
+    to the writable cache of the owning process
+    """
+
+    hits = 0
+    misses = 0
+
+    def __init__(
+        self,
+        db_path: str,
+        fingerprint: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        read_only: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.lock = threading.Lock()
+        # recency of hits is written in batches, so a hit does not hold the
+        # write lock of the database shared with other processes
+        self.uses = {}
+        self.new_verdicts = []  # verdicts to hand over, of a read only cache
+
+        if read_only:
+            self.db = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            row = self.db.execute(
+                "SELECT value FROM meta WHERE key = 'fingerprint'"
+            ).fetchone()
+            # verdicts of other data are never read
+            self.is_stale = row is None or row[0] != fingerprint
+            self.size = self.clock = 0
+            return
+
+        self.is_stale = False
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "word TEXT PRIMARY KEY, suggestion TEXT, reason TEXT, used_at INTEGER)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS verdicts_used_at ON verdicts (used_at)"
+        )
+
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE key = 'fingerprint'"
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            logger.info("Data fingerprint changed, clearing verdict cache")
+            self.db.execute("DELETE FROM verdicts")
+            self.db.execute(
+                "REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                (fingerprint,),
+            )
+        self.db.commit()
+
+        self.size, self.clock = self.db.execute(
+            "SELECT COUNT(*), COALESCE(MAX(used_at), 0) FROM verdicts"
+        ).fetchone()
+
+    def close(self):
+        logger.info("Verdict cache stats: %s", self.stats())
+        with self.lock:
+            if not self.read_only:
+                self.flush_uses()
+                self.db.commit()
+            self.db.close()
+
+    def get(self, word: str):
+        """
+        Get cached verdict of the word
+
+        :param word: str
+        :return: TypoVerdict or None
+        """
+        with self.lock:
+            row = None
+            if not self.is_stale:
+                row = self.db.execute(
+                    "SELECT suggestion, reason FROM verdicts WHERE word = ?", (word,)
+                ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.clock += 1
+            self.uses[word] = self.clock
+
+            if len(self.uses) >= USES_FLUSH_SIZE and not self.read_only:
+                self.flush_uses()
+                self.db.commit()
+
+        return TypoVerdict(word, *row)
+
+    def put(self, verdict: TypoVerdict):
+        self.put_many([verdict])
+
+    def put_many(self, verdicts: list):
+        with self.lock:
+            if self.read_only:
+                self.new_verdicts.extend(verdicts)
+                return
+
+            self.clock += 1
+            inserted = self.db.executemany(
+                "INSERT OR IGNORE INTO verdicts (word, suggestion, reason, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (verdict.word, verdict.suggestion, verdict.reason, self.clock)
+                    for verdict in verdicts
+                ],
+            ).rowcount
+            self.size += inserted
+
+            if self.size > self.max_entries:
+                self.flush_uses()
+                self.evict()
+
+            self.db.commit()
+
+    def take_changes(self) -> tuple:
+        """
+        Take verdicts and hits collected since the last call
+
+        :return: tuple of list of new TypoVerdict and list of hit words
+        """
+        with self.lock:
+            changes = self.new_verdicts, list(self.uses)
+            self.new_verdicts = []
+            self.uses = {}
+
+        return changes
+
+    def apply_changes(self, verdicts: list, used_words: list):
+        """
+        Store verdicts and hits collected by a read only cache
+
+        :param verdicts: list of TypoVerdict
+        :param used_words: list of str
+        :return:
+        """
+        with self.lock:
+            for word in used_words:
+                self.clock += 1
+                self.uses[word] = self.clock
+
+        if verdicts:
+            self.put_many(verdicts)
+        elif len(self.uses) >= USES_FLUSH_SIZE:
+            with self.lock:
+                self.flush_uses()
+                self.db.commit()
+
+    def flush_uses(self):
+        self.db.executemany(
+            "UPDATE verdicts SET used_at = ? WHERE word = ?",
+            [(used_at, word) for word, used_at in self.uses.items()],
+        )
+        self.uses = {}
+
+    def evict(self):
+        """
+        Drop least recently used verdicts to keep the cache within its size limit
+
+        :return:
+        """
+        count = self.size - self.max_entries + int(self.max_entries * EVICT_FRACTION)
+        self.db.execute(
+            "DELETE FROM verdicts WHERE word IN "
+            "(SELECT word FROM verdicts ORDER BY used_at LIMIT ?)",
+            (count,),
+        )
+        self.size = self.db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        logger.debug(f"Evicted verdicts, {self.size} left in cache")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": self.size}
@@ -0,0 +1,59 @@
+import os
+import struct
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.compact_dictionary import HEADER, CompactDictionary
+
+
+class TestCompactDictionary(unittest.TestCase):
+    DICT_FILE_PATH = "test-words.dict"
+    WORDS = ["sample", "text", "split", "zebra", "a", "café", "text"]
+
+    def setUp(self) -> None:
+        CompactDictionary.build(self.WORDS, self.DICT_FILE_PATH)
+        self.dictionary = CompactDictionary(self.DICT_FILE_PATH)
+
+    def tearDown(self) -> None:
+        self.dictionary.close()
+        os.remove(self.DICT_FILE_PATH)
+
+    def test_contains_same_as_set(self):
+        words = set(self.WORDS)
+
+        for word in self.WORDS + ["", "samples", "tex", "zzz", "cafe", 1, None]:
+            self.assertEqual(word in words, word in self.dictionary, word)
+
+    def test_len_and_iter(self):
+        self.assertEqual(len(set(self.WORDS)), len(self.dictionary))
+        self.assertCountEqual(set(self.WORDS), list(self.dictionary))
+
+    def test_offsets_are_little_endian(self):
+        with open(self.DICT_FILE_PATH, "rb") as file:
+            data = file.read()
+
+        count = len(self.dictionary)
+        offsets = struct.unpack_from(f"<{count + 1}I", data, HEADER.size)
+        self.assertEqual((0, 1, 6), offsets[:3])  # "a", "café"
+
+    def test_reads_on_big_endian_host(self):
+        # a big-endian host swaps the offsets both when writing and reading
+        with patch.object(sys, "byteorder", "big"):
+            CompactDictionary.build(self.WORDS, self.DICT_FILE_PATH)
+            dictionary = CompactDictionary(self.DICT_FILE_PATH)
+
+        self.assertIn("zebra", dictionary)
+        self.assertCountEqual(set(self.WORDS), list(dictionary))
+        dictionary.close()
+
+    def test_rejects_foreign_file(self):
+        with open(self.DICT_FILE_PATH, "wb") as file:
+            file.write(b"not a dictionary")
+
+        with self.assertRaises(ValueError):
+            CompactDictionary(self.DICT_FILE_PATH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+
+from src.count_min_sketch import CountMinSketch
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_estimate(self):
+        sketch = CountMinSketch()
+
+        sketch.add("teh", 3)
+        sketch.update({"teh": 2, "abbility": 1})
+
+        self.assertEqual(5, sketch.estimate("teh"))
+        self.assertEqual(1, sketch.estimate("abbility"))
+        self.assertEqual(0, sketch.estimate("missing"))
+
+    def test_never_undercounts(self):
+        rng = random.Random(0)
+        counts = Counter(f"word{rng.randrange(5000)}" for _ in range(50000))
+        sketch = CountMinSketch(width=1024, depth=4)
+
+        sketch.update(counts)
+
+        for word, count in counts.items():
+            self.assertGreaterEqual(sketch.estimate(word), count)
+
+    def test_long_tail_stream_is_halved(self):
+        rng = random.Random(0)
+        sketch = CountMinSketch(width=512, depth=4, max_total=512 * 50 // 10)
+
+        for _ in range(2000):
+            # a readme of a common typo, identifiers and a long tail of words
+            counts = Counter({"teh": 2})
+            for _ in range(50):
+                if rng.random() < 0.3:
+                    counts[f"id{rng.getrandbits(48):x}"] += 1
+                else:
+                    counts[f"word{min(int(rng.paretovariate(0.5)), 10**6)}"] += 1
+            sketch.update(counts)
+
+        self.assertLessEqual(sketch.total, sketch.max_total)
+        self.assertGreaterEqual(sketch.estimate("teh"), 50)
+        unseen = [sketch.estimate(f"unseen{i}") for i in range(1000)]
+        self.assertLess(max(unseen), 10)
+
+    def test_halve(self):
+        sketch = CountMinSketch(width=128, depth=3, max_total=10)
+
+        sketch.add("teh", 7)
+        sketch.add("abbility", 5)
+
+        self.assertEqual(3, sketch.estimate("teh"))
+        self.assertEqual(2, sketch.estimate("abbility"))
+        self.assertEqual(5, sketch.total)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.sketch")
+            sketch = CountMinSketch(width=128, depth=3)
+            sketch.add("teh", 7)
+            sketch.save(path)
+
+            self.assertEqual(7, CountMinSketch.load(path, 128, 3).estimate("teh"))
+            self.assertEqual(7, CountMinSketch.load(path, 128, 3).total)
+            self.assertEqual(
+                3, CountMinSketch.load(path, 128, 3, max_total=5).estimate("teh")
+            )
+            # saved with other dimensions
+            self.assertEqual(0, CountMinSketch.load(path).estimate("teh"))
+            self.assertEqual(
+                0,
+                CountMinSketch.load(os.path.join(directory, "missing")).estimate("teh"),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import json
 import os
+import tempfile
 import unittest
 
-from src.database import TinyDBProvider
+from src.database import SQLiteProvider, TinyDBProvider
 
 
 class TestTinyDBProvider(unittest.TestCase):
@@ -44,10 +45,121 @@ class TestTinyDBProvider(unittest.TestCase):
         self.assertTrue(self.db.is_already_approved_repo("approved-repo"))
         self.assertFalse(self.db.is_already_approved_repo("repo"))
 
+    def test_bulk_methods(self):
+        self.db.add_to_approved("approved-repo", "tupo", "typo")
+
+        self.assertEqual(2, self.db.add_many_to_ignored(["First", "second", "first"]))
+        self.assertEqual(0, self.db.add_many_to_ignored(["second"]))
+
+        self.assertEqual(
+            ["Third"], self.db.filter_not_ignored(["first", "Third", "SECOND"])
+        )
+        self.assertEqual(
+            ["owner/repo"],
+            self.db.filter_not_approved(["Approved-Repo", "owner/repo"]),
+        )
+        self.assertEqual(3, len(self.db.db))
+
+    def test_indexes_are_loaded(self):
+        self.db.add_to_ignored("Ignored")
+        self.db.add_to_approved("approved-repo", "tupo", "typo")
+        self.db.close()
+
+        self.db = TinyDBProvider(self.DB_FILE_PATH)
+
+        self.assertTrue(self.db.is_ignored("ignored"))
+        self.assertTrue(self.db.is_already_approved_repo("Approved-Repo"))
+        self.assertFalse(self.db.is_ignored("approved-repo"))
+
+    def test_state(self):
+        self.assertIsNone(self.db.get_state("cursor"))
+
+        self.db.set_state("cursor", "2022-01-01T00:00:00Z")
+        self.db.set_state("cursor", "2022-01-02T00:00:00Z")
+
+        self.assertEqual("2022-01-02T00:00:00Z", self.db.get_state("cursor"))
+        self.assertEqual(1, len(self.db.state))
+
     def _read_db_raw_content(self):
         with open(self.DB_FILE_PATH, "r") as f:
             return json.loads(f.read())
 
 
+class TestSQLiteProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "db.sqlite")
+        self.db = SQLiteProvider(self.db_path)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_add_to_approved(self):
+        self.assertNotEqual(
+            -1, self.db.add_to_approved("APPROVED-repo", "Tupo", "typo")
+        )
+        self.assertEqual(-1, self.db.add_to_approved("approved-repo", "tupo", "typo"))
+
+        self.assertTrue(self.db.is_already_approved_repo("approved-repo"))
+        self.assertFalse(self.db.is_already_approved_repo("repo"))
+
+    def test_add_to_ignored(self):
+        self.assertNotEqual(-1, self.db.add_to_ignored("Ignored"))
+        self.assertEqual(-1, self.db.add_to_ignored("ignored"))
+
+        self.assertTrue(self.db.is_ignored("IGNORED"))
+        self.assertFalse(self.db.is_ignored("not-ignored"))
+
+    def test_state(self):
+        self.assertIsNone(self.db.get_state("cursor"))
+
+        self.db.set_state("cursor", "2022-01-01T00:00:00Z")
+        self.db.set_state("cursor", "2022-01-02T00:00:00Z")
+
+        self.assertEqual("2022-01-02T00:00:00Z", self.db.get_state("cursor"))
+
+    def test_bulk_methods(self):
+        self.db.add_to_approved("approved-repo", "tupo", "typo")
+
+        self.assertEqual(2, self.db.add_many_to_ignored(["First", "second", "first"]))
+        self.assertEqual(0, self.db.add_many_to_ignored(["second"]))
+
+        words = ["first", "Third", "SECOND"] + [f"word{i}" for i in range(2000)]
+        self.assertEqual(words[1:2] + words[3:], self.db.filter_not_ignored(words))
+        self.assertEqual(
+            ["owner/repo"],
+            self.db.filter_not_approved(["Approved-Repo", "owner/repo"]),
+        )
+
+    def test_shared_between_connections(self):
+        other = SQLiteProvider(self.db_path)
+        other.add_to_ignored("word")
+
+        self.assertTrue(self.db.is_ignored("word"))
+        other.close()
+
+    def test_migrate_from_tinydb(self):
+        tinydb_path = os.path.join(self.directory.name, "db.json")
+        tinydb = TinyDBProvider(tinydb_path)
+        tinydb.add_to_ignored("ignored")
+        tinydb.add_to_approved("approved-repo", "tupo", "typo")
+        tinydb.set_state("cursor", "2022-01-01T00:00:00Z")
+        tinydb.close()
+
+        self.db.migrate_from_tinydb(tinydb_path)
+        os.remove(tinydb_path)
+        self.db.migrate_from_tinydb(tinydb_path)
+
+        self.assertTrue(self.db.is_ignored("ignored"))
+        self.assertTrue(self.db.is_already_approved_repo("approved-repo"))
+        self.assertEqual("2022-01-01T00:00:00Z", self.db.get_state("cursor"))
+
+    def test_migrate_from_missing_tinydb(self):
+        self.db.migrate_from_tinydb(os.path.join(self.directory.name, "missing.json"))
+
+        self.assertFalse(self.db.is_ignored("ignored"))
+
+
 if __name__ == "__main__":
     unittest.main()
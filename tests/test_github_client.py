@@ -1,7 +1,40 @@
+import datetime
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from src.github_client import GithubClient
+from github3 import exceptions
+
+from src.github_client import (
+    README_EXPRESSIONS,
+    TYPO_BRANCH_NAME,
+    GithubClient,
+    Readme,
+    RepositoryDetails,
+)
+
+
+class FakeSearchIterator:
+    """
+    Search results with the semantics of github3 GitHubIterator: every iter()
+    starts over from the first page request, next() keeps a cursor of its own
+    and total_count is known once the first page is fetched
+    """
+
+    def __init__(self, items: list, total_count: int):
+        self.items = items
+        self.search_total_count = total_count
+        self.total_count = None
+        self.requests = 0
+
+    def __iter__(self):
+        self.requests += 1
+        self.total_count = self.search_total_count
+        yield from self.items
+
+    def __next__(self):
+        if not hasattr(self, "__i__"):
+            self.__i__ = self.__iter__()
+        return next(self.__i__)
 
 
 class TestGithubClient(unittest.TestCase):
@@ -19,6 +52,248 @@ class TestGithubClient(unittest.TestCase):
         client = GithubClient("")
 
         self.assertEqual("erjanmx", client.get_me())
+        self.assertEqual("erjanmx", client.get_me())
+        mock_gh().me.assert_called_once()
+
+    @patch("src.github_client.GitHub")
+    def test_repository_cache(self, mock_gh):
+        mock_gh().repository().full_name = "Owner/Repo"
+        mock_gh().repository().readme().decoded = b"Teh readme"
+        mock_gh().repository.reset_mock()
+        client = GithubClient("")
+
+        self.assertEqual("Teh readme", client.get_repository_readme("Owner/Repo"))
+        self.assertEqual("Teh readme", client.get_repository_readme("owner/repo"))
+        client.get_repository_by_name("https://github.com/owner/repo")
+        mock_gh().repository.assert_called_once_with("Owner", "Repo")
+
+        client.delete_repository("owner/repo")
+        client.get_repository_by_name("owner/repo")
+        self.assertEqual(2, mock_gh().repository.call_count)
+
+    def test_get_repositories_details(self):
+        readme_fields = {f"readme{i}": None for i in range(len(README_EXPRESSIONS))}
+        response = MagicMock()
+        response.json.return_value = {
+            "data": {
+                "repo0": {
+                    **readme_fields,
+                    "nameWithOwner": "owner/first",
+                    "stargazerCount": 42,
+                    "defaultBranchRef": {"name": "main", "target": {"oid": "abc"}},
+                    "readme0": {},  # README.md is not a blob
+                    "readme3": {"text": "Teh readme"},
+                },
+                "repo1": None,
+                "repo2": {
+                    **readme_fields,
+                    "nameWithOwner": "owner/empty",
+                    "stargazerCount": 0,
+                    "defaultBranchRef": None,
+                },
+                "repo3": {
+                    **readme_fields,
+                    "nameWithOwner": "owner/big",
+                    "stargazerCount": 7,
+                    "defaultBranchRef": {"name": "main", "target": {"oid": "def"}},
+                    "readme0": {
+                        "text": "Teh beginning",
+                        "isTruncated": True,
+                        "byteSize": 600_000,
+                    },
+                    "readme3": {"text": "Teh readme", "isTruncated": False},
+                },
+            },
+            "errors": [{"type": "NOT_FOUND", "message": "Could not resolve"}],
+        }
+        self.client.gh.session = MagicMock()
+        self.client.gh.session.post.return_value = response
+
+        details = self.client.get_repositories_details(
+            ["owner/first", "owner/missing", "owner/empty", "owner/big"]
+        )
+
+        self.assertEqual(
+            {
+                "owner/first": RepositoryDetails(
+                    "owner/first", 42, "main", "abc", "Teh readme"
+                ),
+                "owner/empty": RepositoryDetails("owner/empty", 0, None, None, None),
+                # the truncated text is dropped for the REST readme fallback
+                "owner/big": RepositoryDetails("owner/big", 7, "main", "def", None),
+            },
+            details,
+        )
+        self.client.gh.session.post.assert_called_once()
+        self.assertEqual(
+            Readme("README.rst", "Teh readme", "abc"),
+            self.client.readmes["owner/first"],
+        )
+        self.assertNotIn("owner/big", self.client.readmes)
+        _, kwargs = self.client.gh.session.post.call_args
+        self.assertEqual("missing", kwargs["json"]["variables"]["name1"])
+        self.assertIn("repo2: repository(owner: $owner2", kwargs["json"]["query"])
+
+    @patch("src.github_client.GitHub")
+    def test_get_my_typo_pull_requests(self, mock_gh):
+        closed_at = MagicMock()
+        mock_gh().me.return_value = "me"
+        mock_gh().search_issues.return_value = [
+            MagicMock(
+                issue=MagicMock(
+                    html_url="https://github.com/owner/repo/pull/7",
+                    closed_at=closed_at,
+                    number=7,
+                )
+            )
+        ]
+        client = GithubClient("")
+
+        pull_requests = list(
+            client.get_my_typo_pull_requests("closed", closed_since="2022-01-01")
+        )
+
+        self.assertEqual([("owner/repo", closed_at, 7)], pull_requests)
+        mock_gh().search_issues.assert_called_once_with(
+            f"is:pr author:me is:closed head:{TYPO_BRANCH_NAME} closed:>=2022-01-01",
+            sort="updated",
+            order="asc",
+        )
+
+    @patch("src.github_client.GitHub")
+    def test_get_most_starred_repos_for_window(self, mock_gh):
+        counts = {
+            "2022-01-01..2022-01-04": 2500,
+            "2022-01-03..2022-01-04": 900,
+            "2022-01-01..2022-01-02": 1500,
+            "2022-01-02..2022-01-02": 800,
+            "2022-01-01..2022-01-01": 700,
+        }
+
+        searches = []
+
+        def search_repositories(query, **kwargs):
+            window = query.split()[0].replace("created:", "")
+            searches.append(
+                FakeSearchIterator([f"{window}-1", f"{window}-2"], counts[window])
+            )
+            return searches[-1]
+
+        mock_gh().search_repositories.side_effect = search_repositories
+        client = GithubClient("")
+
+        repositories = list(
+            client.get_most_starred_repos_for_window(
+                datetime.date(2022, 1, 1), datetime.date(2022, 1, 4), min_stars=30
+            )
+        )
+
+        self.assertEqual(
+            [
+                "2022-01-03..2022-01-04-1",
+                "2022-01-03..2022-01-04-2",
+                "2022-01-02..2022-01-02-1",
+                "2022-01-02..2022-01-02-2",
+                "2022-01-01..2022-01-01-1",
+                "2022-01-01..2022-01-01-2",
+            ],
+            repositories,
+        )
+        self.assertEqual([1] * 5, [search.requests for search in searches])
+        mock_gh().search_repositories.assert_any_call(
+            "created:2022-01-01..2022-01-04 stars:>=30",
+            sort="stars",
+            order="desc",
+            per_page=100,
+        )
+
+    @patch("src.github_client.GitHub")
+    def test_get_pull_request_head_repository(self, mock_gh):
+        mock_gh().pull_request().head.repo = ("me", "repo-1")
+        mock_gh().repository.return_value = "fork"
+        client = GithubClient("")
+
+        self.assertEqual(
+            "fork", client.get_pull_request_head_repository("owner/repo", 7)
+        )
+        mock_gh().pull_request.assert_called_with("owner", "repo", 7)
+        mock_gh().repository.assert_called_once_with("me", "repo-1")
+
+        mock_gh().pull_request().head.repo = ("", "")
+        self.assertIsNone(client.get_pull_request_head_repository("owner/repo", 8))
+
+    def make_repositories(self, mock_gh):
+        repo = MagicMock(full_name="owner/repo", default_branch="main")
+        repo.name = "repo"
+        repo.readme().path = "docs/README.md"
+        repo.readme().decoded = b"Teh readme"
+        repo.ref().object.sha = "head"
+        repo.git_commit().tree.sha = "tree"
+
+        fork = MagicMock(full_name="me/repo", fork=True, url="https://fork")
+        fork.parent.full_name = "owner/repo"
+        fork.create_tree().sha = "new-tree"
+        fork.create_commit().sha = "commit"
+
+        mock_gh().me.return_value = "me"
+        mock_gh().repository.side_effect = lambda owner, name: {
+            "owner": repo,
+            "me": fork,
+        }[owner]
+        mock_gh().session.post().status_code = 200
+
+        return repo, fork
+
+    @patch("src.github_client.GitHub")
+    def test_create_fix_typo_pull_request(self, mock_gh):
+        repo, fork = self.make_repositories(mock_gh)
+        repo.pull_requests.return_value = iter([])
+        fork.ref.side_effect = exceptions.NotFoundError(MagicMock(status_code=404))
+        client = GithubClient("")
+
+        pull_request = client.create_fix_typo_pull_request("owner/repo", "The readme")
+
+        self.assertEqual(repo.create_pull(), pull_request)
+        repo.create_fork.assert_not_called()
+        mock_gh().session.post.assert_called_with(
+            "https://fork/merge-upstream", json={"branch": "main"}
+        )
+        fork.create_tree.assert_called_with(
+            [
+                {
+                    "path": "docs/README.md",
+                    "mode": "100644",
+                    "type": "blob",
+                    "content": "The readme",
+                }
+            ],
+            "tree",
+        )
+        fork.create_commit.assert_called_with("Fix readme typo", "new-tree", ["head"])
+        fork.create_ref.assert_called_once_with(
+            f"refs/heads/{TYPO_BRANCH_NAME}", "commit"
+        )
+        fork.delete.assert_not_called()
+
+    @patch("src.github_client.time.sleep")
+    @patch("src.github_client.GitHub")
+    def test_create_fix_typo_pull_request_is_retryable(self, mock_gh, _):
+        repo, fork = self.make_repositories(mock_gh)
+        existing = MagicMock()
+        repo.pull_requests.return_value = iter([existing])
+        fork.create_commit.reset_mock()
+        fork.create_commit.side_effect = [
+            exceptions.ServerError(MagicMock(status_code=502)),
+            MagicMock(sha="commit"),
+        ]
+        client = GithubClient("")
+
+        pull_request = client.create_fix_typo_pull_request("owner/repo", "The readme")
+
+        self.assertEqual(existing, pull_request)
+        self.assertEqual(2, fork.create_commit.call_count)
+        fork.ref().update.assert_called_once_with("commit", force=True)
+        repo.create_pull.assert_not_called()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.http_cache import CachingAdapter, HttpCache
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    etag = '"v1"'
+    body = b'{"name": "readme"}'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("If-None-Match"))
+
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("X-RateLimit-Remaining", "4999")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", self.etag)
+        self.send_header("X-RateLimit-Remaining", "4998")
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self) -> None:
+        FakeHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/repos/a/b/readme"
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(os.path.join(self.directory.name, "http.sqlite"))
+
+        self.session = requests.Session()
+        self.session.mount("http://", CachingAdapter(self.cache))
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.cache.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_revalidate(self):
+        first = self.session.get(self.url)
+        second = self.session.get(self.url)
+
+        self.assertEqual([None, '"v1"'], FakeHandler.requests)
+        self.assertEqual(200, second.status_code)
+        self.assertEqual({"name": "readme"}, second.json())
+        self.assertEqual(first.content, second.content)
+        self.assertTrue(second.from_cache)
+        self.assertEqual("4999", second.headers["X-RateLimit-Remaining"])
+        self.assertEqual(1, self.cache.stats()["hits"])
+        self.assertEqual(1, self.cache.stats()["misses"])
+
+    def test_changed_response_replaces_cached(self):
+        self.session.get(self.url)
+
+        FakeHandler.etag = '"v2"'
+        FakeHandler.body = b'{"name": "changed"}'
+        try:
+            response = self.session.get(self.url)
+        finally:
+            FakeHandler.etag = '"v1"'
+            FakeHandler.body = b'{"name": "readme"}'
+
+        self.assertEqual({"name": "changed"}, response.json())
+        self.assertEqual('"v2"', self.cache.get(self.cache_key())[0])
+
+    def test_evict(self):
+        cache = HttpCache(os.path.join(self.directory.name, "small.sqlite"), 100)
+
+        for i in range(10):
+            cache.put(f"key{i}", '"etag"', None, {}, b"x" * 30)
+        cache.get("key7")
+        cache.put("key10", '"etag"', None, {}, b"x" * 30)
+
+        self.assertLessEqual(cache.stats()["bytes"], 100)
+        self.assertIsNotNone(cache.get("key7"))
+        self.assertIsNotNone(cache.get("key10"))
+        self.assertIsNone(cache.get("key0"))
+        cache.close()
+
+    def test_hit_does_not_lock_other_connections(self):
+        path = os.path.join(self.directory.name, "shared.sqlite")
+        cache = HttpCache(path)
+        other = HttpCache(path)
+        other.db.execute("PRAGMA busy_timeout = 100")
+        cache.put("key", '"etag"', None, {}, b"body")
+
+        cache.get("key")
+        other.put("other", '"etag"', None, {}, b"body")
+
+        self.assertIsNotNone(cache.get("other"))
+        other.close()
+        cache.close()
+
+    def test_persistence(self):
+        self.session.get(self.url)
+        self.cache.close()
+
+        self.cache = HttpCache(os.path.join(self.directory.name, "http.sqlite"))
+
+        self.assertEqual(len(FakeHandler.body), self.cache.stats()["bytes"])
+        self.assertIsNotNone(self.cache.get(self.cache_key()))
+
+    def cache_key(self) -> str:
+        return f"{requests.utils.default_headers()['Accept']} {self.url}"
+
+
+if __name__ == "__main__":
+    unittest.main()
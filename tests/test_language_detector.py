@@ -1,6 +1,7 @@
 import unittest
+from unittest.mock import patch
 
-from src.language_detector import LanguageDetector
+from src.language_detector import MAX_SAMPLE_LENGTH, LanguageDetector
 
 
 class TestLanguageDetector(unittest.TestCase):
@@ -16,6 +17,40 @@ class TestLanguageDetector(unittest.TestCase):
         self.assertTrue(detector.is_english("Launching unittests with arguments"))
         self.assertFalse(detector.is_english("Запуск тестирования с аргументами"))
 
+    def test_classify(self):
+        english = (
+            "This is a library for the training of neural networks and it is simple to use. "
+            * 3
+        )
+        french = (
+            "Ceci est une bibliothèque pour entraîner des réseaux de neurones. " * 5
+        )
+
+        self.assertTrue(LanguageDetector.classify(english))
+        self.assertFalse(LanguageDetector.classify("Запуск тестирования с аргументами"))
+        self.assertIsNone(LanguageDetector.classify(french))
+        self.assertIsNone(LanguageDetector.classify("Sample text here"))
+
+    def test_get_sample(self):
+        text = "a" * 5000 + "b" * 5000 + "c" * 5000
+
+        sample = LanguageDetector.get_sample(text)
+
+        self.assertLessEqual(len(sample), MAX_SAMPLE_LENGTH + 2)
+        self.assertTrue(sample.startswith("a"))
+        self.assertIn("b", sample)
+        self.assertTrue(sample.endswith("c"))
+        self.assertEqual(LanguageDetector.get_sample("short"), "short")
+
+    def test_is_english_cached(self):
+        detector = LanguageDetector()
+
+        with patch.object(detector, "detect", return_value="en") as detect:
+            self.assertTrue(detector.is_english("Sample text here"))
+            self.assertTrue(detector.is_english("Sample text here"))
+
+        detect.assert_called_once_with("Sample text here")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+
+from src.morphology import Morphology
+
+
+class TestMorphology(unittest.TestCase):
+    PLURALS_FILE_PATH = "test-plurals.tsv"
+
+    def tearDown(self) -> None:
+        if os.path.exists(self.PLURALS_FILE_PATH):
+            os.remove(self.PLURALS_FILE_PATH)
+
+    def test_plural(self):
+        morphology = Morphology({"story": "stories"})
+
+        self.assertEqual("stories", morphology.plural("story"))
+        self.assertEqual("mice", morphology.plural("mouse"))
+
+    def test_is_plural_pair(self):
+        morphology = Morphology({"story": "stories", "mouse": "mice"})
+        inflect_plural = morphology.inflect_plural
+        morphology.inflect_plural = None  # the table alone answers pairs it holds
+
+        self.assertTrue(morphology.is_plural_pair("stories", "story"))
+        self.assertTrue(morphology.is_plural_pair("story", "stories"))
+        self.assertTrue(morphology.is_plural_pair("mouse", "mice"))
+
+        morphology.inflect_plural = inflect_plural
+        self.assertFalse(morphology.is_plural_pair("stores", "story"))
+        self.assertFalse(morphology.is_plural_pair("tehre", "mice"))
+
+    def test_is_plural_pair_singular_missing_from_table(self):
+        Morphology().build_plurals(["redskins", "showgrounds"], self.PLURALS_FILE_PATH)
+        morphology = Morphology(Morphology.load_plurals(self.PLURALS_FILE_PATH))
+
+        self.assertTrue(morphology.is_plural_pair("redskin", "redskins"))
+        self.assertTrue(morphology.is_plural_pair("showground", "showgrounds"))
+
+    def test_is_plural_pair_table_agrees_with_inflect(self):
+        vocabulary = ["stories", "mice", "redskins", "there", "analyses", "story"]
+        Morphology().build_plurals(vocabulary, self.PLURALS_FILE_PATH)
+        table = Morphology(Morphology.load_plurals(self.PLURALS_FILE_PATH))
+        computed = Morphology({})
+
+        words = ["story", "mouse", "redskin", "tehre", "analysis", "storys"]
+        for word in words:
+            for known in vocabulary:
+                self.assertEqual(
+                    computed.is_plural_pair(word, known),
+                    table.is_plural_pair(word, known),
+                    (word, known),
+                )
+
+    def test_is_plural_pair_not_in_table(self):
+        morphology = Morphology({})
+
+        self.assertTrue(morphology.is_plural_pair("stories", "story"))
+        self.assertFalse(morphology.is_plural_pair("tehre", "there"))
+
+    def test_build_and_load_plurals(self):
+        words = ["story", "text", "mouse", "two words", ""]
+
+        count = Morphology().build_plurals(words, self.PLURALS_FILE_PATH)
+
+        self.assertEqual(3, count)
+        self.assertEqual(
+            {"story": "stories", "text": "texts", "mouse": "mice"},
+            Morphology.load_plurals(self.PLURALS_FILE_PATH),
+        )
+
+    def test_load_missing_plurals(self):
+        self.assertEqual({}, Morphology.load_plurals(self.PLURALS_FILE_PATH))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from src.parallel_typo_detector import ParallelTypoDetector
+from src.typo_detector import TypoDetector
+from src.typo_detector_dict import TypoDetectorDict
+from src.verdict_cache import VerdictCache
+
+DB_FILE_PATH = "test-parallel-verdicts.sqlite"
+
+
+class FakeSpeller:
+    def autocorrect_word(self, word: str) -> str:
+        return {"abbility": "ability", "aboue": "above"}.get(word, word)
+
+
+def create_worker_detector() -> TypoDetector:
+    cache = VerdictCache(DB_FILE_PATH, fingerprint="v1", read_only=True)
+    return TypoDetector(FakeSpeller(), cache=cache, words={"there", "is"})
+
+
+class TestParallelTypoDetector(unittest.TestCase):
+    def setUp(self) -> None:
+        self.detector = ParallelTypoDetector(TypoDetectorDict, workers=2, chunk_size=1)
+
+    def tearDown(self) -> None:
+        self.detector.close()
+
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(DB_FILE_PATH + suffix):
+                os.remove(DB_FILE_PATH + suffix)
+
+    def test_get_verdicts_batch_keeps_order(self):
+        texts = ["there is abbility", "nothing here", "aboue and acccess"]
+
+        verdicts = self.detector.get_verdicts_batch(texts)
+
+        self.assertEqual(TypoDetectorDict().get_verdicts_batch(texts), verdicts)
+
+    def test_get_possible_typos_with_suggestions(self):
+        self.assertEqual(
+            {"abbility": "ability"},
+            self.detector.get_possible_typos_with_suggestions("an abbility"),
+        )
+
+    def test_min_batch_size(self):
+        detector = ParallelTypoDetector(TypoDetectorDict, workers=3, chunk_size=4)
+
+        self.assertEqual(12, detector.min_batch_size)
+
+    def test_workers_verdicts_are_cached_by_parent(self):
+        cache = VerdictCache(DB_FILE_PATH, fingerprint="v1")
+        self.detector = ParallelTypoDetector(
+            create_worker_detector, workers=2, chunk_size=1, cache=cache
+        )
+        texts = ["there is abbility", "aboue", "abbility is there"]
+
+        verdicts = self.detector.get_verdicts_batch(texts)
+        self.assertEqual(verdicts, self.detector.get_verdicts_batch(texts))
+
+        self.assertEqual("ability", verdicts[0]["abbility"].suggestion)
+        self.assertEqual(verdicts[1]["aboue"], cache.get("aboue"))
+        self.assertEqual(2, cache.stats()["size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from requests import Response
+
+from src.rate_limiter import (
+    BASE_BACKOFF,
+    RateLimitedAdapter,
+    RateLimiter,
+    get_resource,
+    high_priority,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_response(status: int = 200, **headers) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response._content = b""
+    response.raw = io.BytesIO()
+    return response
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+
+    def test_get_resource(self):
+        self.assertEqual(
+            "search", get_resource("https://api.github.com/search/repositories?q=a")
+        )
+        self.assertEqual("graphql", get_resource("https://api.github.com/graphql"))
+        self.assertEqual(
+            "core", get_resource("https://api.github.com/repos/a/b/readme")
+        )
+
+    def test_pacing(self):
+        # the whole search budget is available, except the reserve
+        for _ in range(27):
+            self.limiter.acquire("search")
+        self.assertEqual([], self.clock.sleeps)
+
+        self.limiter.acquire("search")
+
+        # 30 requests per minute refill a token every 2 seconds
+        self.assertAlmostEqual(2, sum(self.clock.sleeps))
+
+    def test_high_priority_uses_reserve(self):
+        for _ in range(27):
+            self.limiter.acquire("search")
+
+        with high_priority():
+            for _ in range(3):
+                self.limiter.acquire("search")
+
+        self.assertEqual([], self.clock.sleeps)
+
+    def test_update_blocks_until_reset(self):
+        self.limiter.update(
+            "core",
+            {
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(self.clock.now + 30),
+            },
+        )
+
+        with high_priority():
+            self.limiter.acquire("core")
+
+        self.assertAlmostEqual(30, sum(self.clock.sleeps))
+        self.assertEqual(0, self.limiter.budget()["core"]["blocked_for"])
+
+    def test_budget(self):
+        self.limiter.update(
+            "core",
+            {
+                "X-RateLimit-Resource": "search",
+                "X-RateLimit-Limit": "30",
+                "X-RateLimit-Remaining": "12",
+                "X-RateLimit-Reset": "0",
+            },
+        )
+
+        budget = self.limiter.budget()
+
+        self.assertEqual(12, budget["search"]["remaining"])
+        self.assertEqual(5000, budget["core"]["remaining"])
+
+    def test_adapter_retries_secondary_rate_limit(self):
+        adapter = MagicMock()
+        adapter.send.side_effect = [
+            make_response(403, **{"Retry-After": "10"}),
+            make_response(429),
+            make_response(200),
+        ]
+        request = MagicMock(url="https://api.github.com/repos/a/b/forks")
+
+        response = RateLimitedAdapter(self.limiter, adapter).send(request)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, adapter.send.call_count)
+        self.assertAlmostEqual(10 + BASE_BACKOFF * 2, sum(self.clock.sleeps))
+
+    def test_adapter_refunds_not_modified(self):
+        cached = make_response(200)
+        cached.from_cache = True
+        adapter = MagicMock()
+        adapter.send.side_effect = [make_response(304), cached, make_response(200)]
+        request = MagicMock(url="https://api.github.com/repos/a/b/readme")
+        rate_limited_adapter = RateLimitedAdapter(self.limiter, adapter)
+
+        rate_limited_adapter.send(request)
+        rate_limited_adapter.send(request)
+        self.assertEqual(5000, self.limiter.budget()["core"]["remaining"])
+
+        rate_limited_adapter.send(request)
+        self.assertEqual(4999, self.limiter.budget()["core"]["remaining"])
+
+        # the budget reported by the server is kept as is
+        adapter.send.side_effect = [
+            make_response(
+                304,
+                **{
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Remaining": "4000",
+                    "X-RateLimit-Reset": str(self.clock.now + 600),
+                },
+            )
+        ]
+        rate_limited_adapter.send(request)
+        self.assertEqual(4000, self.limiter.budget()["core"]["remaining"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from src.readme_tokenizer import get_first_offsets, tokenize
+
+
+class TestReadmeTokenizer(unittest.TestCase):
+    def test_tokenize(self):
+        text = "Here is a sample text to be split"
+
+        self.assertEqual(
+            [("sample", 10), ("text", 17), ("split", 28)], list(tokenize(text))
+        )
+
+    def test_tokenize_skips_markup(self):
+        text = """# Title
+
+Some prose with tehre
+
+```bash
+pip install somepackage
+```
+
+Run `mytool --flag` or visit https://example.com/path/word and [link text](docs/folder).
+<img src="image/picture.png" alt="picture"/> <!-- hidden comment -->
+[![badge](https://img.shields.io/badge/build-passing)](https://ci.example.com)
+
+[reference]: https://example.com/reference
+  ~~~
+  indented fenced code
+  ~~~
+last words"""
+
+        self.assertEqual(
+            ["prose", "with", "tehre", "visit", "last", "words"],
+            [word for word, _ in tokenize(text)],
+        )
+
+    def test_get_first_offsets(self):
+        text = "```\nsleapy\n```\nnot sleapy, sleapy here"
+
+        offsets = get_first_offsets(text)
+
+        self.assertEqual({"sleapy": 27, "here": 34}, offsets)
+        self.assertEqual("sleapy", text[offsets["sleapy"] : offsets["sleapy"] + 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from src.repo_readme_typo import RepoReadmeTypo
+from src.readme_document import ReadmeDocument
+from src.repo_readme_typo import RepoReadmeTypo, get_typos_with_context
 
 
 class TestRepoTypo(unittest.TestCase):
@@ -60,6 +61,57 @@ https
             "Large-scale Pretraining for Text-to-Video Generation", context
         )
 
+    def test_get_typo_context_whole_word(self):
+        test_readme = "Sometimes typos happen. Here is a typo in the text"
+
+        repo_typo = RepoReadmeTypo(
+            repository="", readme=test_readme, word="typo", suggested="type"
+        )
+
+        self.assertEqual(
+            "Here is a typo in the text", repo_typo.get_typo_with_context()
+        )
+
+    def test_typos_share_document(self):
+        document = ReadmeDocument(
+            "```\ntehre = 1\n```\nThis is sumple text, tehre and tehre again"
+        )
+
+        first = RepoReadmeTypo("", word="sumple", suggested="simple", document=document)
+        second = RepoReadmeTypo("", word="tehre", suggested="there", document=document)
+
+        self.assertIs(first.readme, second.readme)
+        self.assertEqual("This is sumple text", first.get_typo_with_context())
+        self.assertEqual("tehre and tehre again", second.get_typo_with_context())
+        self.assertEqual(1, first.get_word_readme_occurrence_count())
+        self.assertEqual(3, second.get_word_readme_occurrence_count())
+
+    def test_get_typos_with_context(self):
+        document = ReadmeDocument(
+            "This is sumple text.Here is anothr sentence, with tehre"
+        )
+
+        contexts = get_typos_with_context(
+            document, ["sumple", "anothr", "tehre", "missing"]
+        )
+
+        self.assertEqual(
+            {
+                "sumple": "This is sumple text",
+                "anothr": "Here is anothr sentence",
+                "tehre": "with tehre",
+                "missing": "missing",
+            },
+            contexts,
+        )
+
+    def test_get_word_readme_occurrence_count_whole_words(self):
+        repo_typo = RepoReadmeTypo(
+            "", readme="typo typos, typo_name typo", word="typo", suggested="type"
+        )
+
+        self.assertEqual(2, repo_typo.get_word_readme_occurrence_count())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import json
+import os
+import time
+import unittest
+
+from src.snapshot import Snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    SNAPSHOT_FILE_PATH = "test.snapshot"
+    WORD_COUNT_FILE_PATH = "test-word-count.json"
+    WORDS_FILE_PATH = "test-words.txt"
+
+    def setUp(self) -> None:
+        with open(self.WORD_COUNT_FILE_PATH, "w") as f:
+            json.dump({"there": 10, "sleepy": 2}, f)
+
+        with open(self.WORDS_FILE_PATH, "w") as f:
+            f.write("there\nsleepy\n")
+
+    def tearDown(self) -> None:
+        for path in [
+            self.SNAPSHOT_FILE_PATH,
+            self.WORD_COUNT_FILE_PATH,
+            self.WORDS_FILE_PATH,
+        ]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_build_and_load(self):
+        Snapshot.build(
+            self.SNAPSHOT_FILE_PATH,
+            self.WORD_COUNT_FILE_PATH,
+            self.WORDS_FILE_PATH,
+            with_deletes=True,
+        )
+
+        snapshot = self._load()
+
+        self.assertEqual({"there": 10, "sleepy": 2}, snapshot.nlp_data)
+        self.assertEqual(frozenset(["there", "sleepy"]), snapshot.words)
+        self.assertIn("thre", snapshot.deletes)
+
+    def test_load_missing(self):
+        self.assertIsNone(self._load())
+
+    def test_load_stale(self):
+        Snapshot.build(
+            self.SNAPSHOT_FILE_PATH, self.WORD_COUNT_FILE_PATH, self.WORDS_FILE_PATH
+        )
+
+        time.sleep(0.01)
+        with open(self.WORDS_FILE_PATH, "a") as f:
+            f.write("another\n")
+
+        self.assertIsNone(self._load())
+
+    def _load(self):
+        return Snapshot.load(
+            self.SNAPSHOT_FILE_PATH, self.WORD_COUNT_FILE_PATH, self.WORDS_FILE_PATH
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
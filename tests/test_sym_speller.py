@@ -0,0 +1,55 @@
+import json
+import os
+import unittest
+
+from autocorrect import Speller
+
+from src.sym_speller import SymSpeller, get_deletes, get_edit_distance
+from src.typo_detector import TypoDetector
+from src.typo_detector_dict import TypoDetectorDict
+
+WORD_COUNT_PATH = os.path.join(os.path.dirname(__file__), "../data/word_count.json")
+
+
+class TestSymSpeller(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(WORD_COUNT_PATH) as file:
+            nlp_data = json.load(file)
+
+        cls.speller = Speller(nlp_data=nlp_data)
+        cls.sym_speller = SymSpeller(nlp_data)
+
+    def test_get_deletes(self):
+        self.assertEqual({"abc", "ab", "ac", "bc"}, get_deletes("abc", 1))
+
+    def test_get_edit_distance(self):
+        self.assertEqual(0, get_edit_distance("there", "there", 2))
+        self.assertEqual(1, get_edit_distance("tehre", "there", 2))
+        self.assertEqual(2, get_edit_distance("sleapy", "sleepy2", 2))
+        self.assertEqual(3, get_edit_distance("sample", "text", 2))
+
+    def test_same_suggestions_as_speller(self):
+        words = ["giong", "sleapy", "tehre", "possibel", "Possibel", "desingX", "WSGI"]
+        words += list(TypoDetectorDict.load_typos())
+
+        for word in words:
+            self.assertEqual(
+                self.speller.autocorrect_word(word),
+                self.sym_speller.autocorrect_word(word),
+                word,
+            )
+
+    def test_get_possible_typos(self):
+        detector = TypoDetector(self.sym_speller)
+
+        test_text = "I'm not sleapy and tehre is no place I'm giong to."
+        expected_typos = {"giong": "going", "sleapy": "sleepy", "tehre": "there"}
+
+        self.assertEqual(
+            expected_typos, detector.get_possible_typos_with_suggestions(test_text)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
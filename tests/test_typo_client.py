@@ -0,0 +1,218 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from github3.exceptions import NotFoundError
+
+from src.action import Action
+from src.count_min_sketch import CountMinSketch
+from src.github_client import RepositoryDetails
+from src.typo_client import TypoClient
+from src.typo_detector_dict import TypoDetectorDict
+
+README = "This readme has an abbility to show some text in the language of choice"
+
+
+def make_repository(full_name: str, stargazers_count: int = 100):
+    repository = MagicMock(full_name=full_name, stargazers_count=stargazers_count)
+    return MagicMock(repository=repository)
+
+
+class TestTypoClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.github = MagicMock()
+        self.github.get_repositories_details.side_effect = lambda names: {
+            name: RepositoryDetails(name, 100, "main", "sha", README + " aboue")
+            for name in names
+        }
+
+        self.database = MagicMock()
+        self.database.filter_not_approved.side_effect = list
+        self.database.filter_not_ignored.side_effect = list
+
+        self.client = TypoClient(
+            github=self.github,
+            database=self.database,
+            typo_detector=TypoDetectorDict(),
+            readme_batch_size=2,
+        )
+
+    def test_get_repo_typo(self):
+        self.github.get_most_starred_repos_for_window.return_value = [
+            make_repository("owner/first"),
+            make_repository("owner/second"),
+        ]
+
+        typos = list(self.client.get_repo_typo("2022-01-01"))
+
+        self.assertEqual(
+            [
+                ("owner/first", "abbility", "ability"),
+                ("owner/first", "aboue", "about"),
+                ("owner/second", "abbility", "ability"),
+                ("owner/second", "aboue", "about"),
+            ],
+            sorted((t.repository, t.maybe_typo, t.suggested_word) for t in typos),
+        )
+        self.github.get_repositories_details.assert_called_once_with(
+            ["owner/first", "owner/second"]
+        )
+        self.github.get_repository_readme.assert_not_called()
+
+    def test_get_repo_typo_falls_back_to_rest_readme(self):
+        self.github.get_most_starred_repos_for_window.return_value = [
+            make_repository("owner/docs"),
+            make_repository("owner/missing"),
+            make_repository("owner/empty"),
+        ]
+        self.github.get_repositories_details.side_effect = lambda names: {
+            "owner/docs": RepositoryDetails("owner/docs", 100, "main", "sha", None),
+            "owner/empty": RepositoryDetails("owner/empty", 100, "main", "sha", ""),
+        }
+        self.github.get_repository_readme.return_value = README
+
+        typos = list(self.client.get_repo_typo("2022-01-01"))
+
+        self.assertEqual(
+            ["owner/docs", "owner/missing"], sorted({t.repository for t in typos})
+        )
+        self.assertEqual(2, self.github.get_repository_readme.call_count)
+
+    def test_get_repo_typo_filters_in_bulk(self):
+        self.github.get_most_starred_repos_for_window.return_value = [
+            make_repository("owner/first"),
+            make_repository("owner/approved"),
+        ]
+        self.database.filter_not_approved.side_effect = lambda names: names[:1]
+        self.database.filter_not_ignored.side_effect = lambda words: [
+            word for word in words if word != "aboue"
+        ]
+
+        typos = list(self.client.get_repo_typo("2022-01-01"))
+
+        self.assertEqual(
+            [("owner/first", "abbility")],
+            [(t.repository, t.maybe_typo) for t in typos],
+        )
+        self.database.filter_not_approved.assert_called_once_with(
+            ["owner/first", "owner/approved"]
+        )
+        self.database.filter_not_ignored.assert_called_once()
+        self.database.is_ignored.assert_not_called()
+
+    def test_too_frequent_words_are_ignored(self):
+        readme = " ".join(
+            ["aboue"] * 30 + ["Abbility"] * 5 + ["abbility"] * 5 + ["the", "text"]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.sketch")
+
+            client = TypoClient(
+                github=self.github,
+                database=self.database,
+                typo_detector=TypoDetectorDict(),
+                word_sketch_path=path,
+            )
+            verdicts = client.typo_detector.get_verdicts_batch([readme])[0]
+            for repository in ["owner/first", "owner/second"]:
+                list(
+                    client.get_readme_typo(
+                        make_repository(repository).repository, readme, verdicts
+                    )
+                )
+            client.save_word_sketch()
+
+            self.database.add_many_to_ignored.assert_called_once_with(["aboue"])
+            sketch = CountMinSketch.load(path)
+            self.assertEqual(20, sketch.estimate("abbility"), "persisted")
+            self.assertEqual(80, sketch.total, "only possible typos are counted")
+
+    def test_search_window(self):
+        self.github.get_most_starred_repos_for_window.return_value = []
+        self.client.search_window_days = 7
+        self.client.look_date = datetime.datetime(2022, 1, 31)
+
+        list(self.client.get_repo_typo(self.client.get_date()))
+        self.client.lower_look_date()
+
+        self.github.get_most_starred_repos_for_window.assert_called_once_with(
+            datetime.date(2022, 1, 25), datetime.date(2022, 1, 31), min_stars=30
+        )
+        self.assertEqual("2022-01-24", self.client.get_date())
+
+    def test_get_repo_typo_skip_repo(self):
+        self.github.get_most_starred_repos_for_window.return_value = [
+            make_repository("owner/first"),
+            make_repository("owner/second"),
+        ]
+
+        generator = self.client.get_repo_typo("2022-01-01")
+        first = next(generator)
+        second = generator.send(Action.SKIP_REPO)
+
+        self.assertEqual("owner/first", first.repository)
+        self.assertEqual("owner/second", second.repository)
+
+    def test_delete_forks_with_closed_pull_requests(self):
+        def make_fork(name, parent, fork=True):
+            repository = MagicMock(full_name=name, fork=fork)
+            repository.parent.full_name = parent
+            return repository
+
+        def get_closed(state, closed_since=None):
+            if state == "open":
+                return [("owner/reused", None, 1)]
+            return [
+                ("owner/reused", datetime.datetime(2022, 1, 1), 2),
+                ("owner/second", datetime.datetime(2022, 1, 3), 3),
+                ("Owner/First", datetime.datetime(2021, 12, 31), 4),
+                ("Owner/First", datetime.datetime(2022, 1, 2), 5),
+                ("owner/gone", datetime.datetime(2022, 1, 4), 6),
+                ("owner/other", datetime.datetime(2022, 1, 5), 7),
+                ("owner/deleted", datetime.datetime(2022, 1, 6), 8),
+            ]
+
+        # forks are named by GitHub, e.g. on a name clash
+        heads = {
+            ("owner/first", 5): make_fork("me/First-1", "Owner/First"),
+            ("owner/second", 3): make_fork("me/second", "owner/second"),
+            ("owner/other", 7): make_fork("me/other", "someone/other"),
+            ("owner/deleted", 8): None,
+        }
+
+        def get_pull_request_head_repository(repository, number):
+            if (repository, number) not in heads:
+                raise NotFoundError(MagicMock(status_code=404))
+            return heads[(repository, number)]
+
+        self.github.get_my_typo_pull_requests.side_effect = get_closed
+        self.github.get_pull_request_head_repository.side_effect = (
+            get_pull_request_head_repository
+        )
+        self.github.delete_repository.side_effect = (
+            lambda fork: fork.full_name != "me/second"
+        )
+        self.database.get_state.return_value = "2021-12-31T00:00:00Z"
+
+        self.client.delete_forks_with_closed_pull_requests()
+
+        self.github.get_my_typo_pull_requests.assert_called_with(
+            "closed", closed_since="2021-12-31T00:00:00Z"
+        )
+        self.assertEqual(
+            {"me/First-1", "me/second"},
+            {
+                args[0].full_name
+                for args, _ in self.github.delete_repository.call_args_list
+            },
+        )
+        # the sweep resumes from the failed deletion
+        self.database.set_state.assert_called_once_with(
+            "fork_cleanup_cursor", "2022-01-03T00:00:00Z"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
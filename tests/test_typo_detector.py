@@ -1,6 +1,6 @@
 import unittest
 
-from src.typo_detector import TypoDetector
+from src.typo_detector import Reason, TypoDetector, TypoVerdict
 
 
 class TestTypoDetector(unittest.TestCase):
@@ -32,6 +32,46 @@ class TestTypoDetector(unittest.TestCase):
             expected_typos, detector.get_possible_typos_with_suggestions(test_text)
         )
 
+    def test_get_verdicts_batch(self):
+        detector = TypoDetector()
+
+        verdicts = detector.get_verdicts_batch(
+            ["There is sample tehre", "tehre are stories", ""]
+        )
+
+        self.assertEqual(3, len(verdicts))
+        self.assertEqual(
+            {
+                "sample": TypoVerdict("sample", None, Reason.DICTIONARY),
+                "tehre": TypoVerdict("tehre", "there"),
+            },
+            verdicts[0],
+        )
+        self.assertEqual(verdicts[0]["tehre"], verdicts[1]["tehre"])
+        self.assertTrue(verdicts[1]["tehre"].is_typo)
+        self.assertFalse(verdicts[1]["stories"].is_typo)
+        self.assertEqual({}, verdicts[2])
+
+    def test_get_inflection_reason(self):
+        detector = TypoDetector()
+
+        self.assertEqual(
+            Reason.PLURAL, detector.get_inflection_reason("story", "stories")
+        )
+        self.assertEqual(
+            Reason.PLURAL, detector.get_inflection_reason("stories", "story")
+        )
+        self.assertEqual(
+            Reason.PREFIX_UN, detector.get_inflection_reason("unset", "set")
+        )
+        self.assertEqual(
+            Reason.PREFIX_RE, detector.get_inflection_reason("placed", "replaced")
+        )
+        self.assertEqual(
+            Reason.SUFFIX_D, detector.get_inflection_reason("Force", "forced")
+        )
+        self.assertIsNone(detector.get_inflection_reason("tehre", "there"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import os
+import re
+import time
+import unittest
+
+from src.typo_detector import TypoDetector, TypoVerdict
+from src.typo_detector_dict import TYPOS_PATH, TypoDetectorDict, build_trie_pattern
+
+
+class TestTypoDetectorDict(unittest.TestCase):
+    TYPOS_FILE_PATH = "test-typos.txt"
+
+    def setUp(self) -> None:
+        self._write_typos("abbility: ability\naboue: about\naboutt: about\n")
+        self.detector = TypoDetectorDict(self.TYPOS_FILE_PATH)
+
+    def tearDown(self) -> None:
+        os.remove(self.TYPOS_FILE_PATH)
+
+    def test_build_trie_pattern(self):
+        regex = re.compile(
+            r"\b(?:{})\b".format(build_trie_pattern(["abc", "abcd", "abx"]))
+        )
+
+        self.assertEqual(["abc", "abcd", "abx"], regex.findall("abc abcd abx abce ab"))
+        self.assertEqual([], re.findall(build_trie_pattern([]), "any text"))
+
+    def test_get_possible_typos_with_suggestions(self):
+        text = """The abbility and Aboue, aboutt.
+
+```
+aboue in code is skipped
+```
+"""
+        self.assertEqual(
+            {"abbility": "ability"},
+            self.detector.get_possible_typos_with_suggestions(text),
+        )
+
+    def test_matches_typos_of_tokenized_words(self):
+        typos = TypoDetectorDict.load_typos(TYPOS_PATH)
+        detector = TypoDetectorDict(TYPOS_PATH)
+        corpus = [
+            "There is an abbility to log in, abbility. (aboue) and Aboue too",
+            "See [the acccess docs](https://example.com/acccess) or "
+            "[acccess](docs/aboue.md) and ![aboue](badge.svg)",
+            "Run `acceptible --fix` and\n```\naccepyed\n```\nthen accepyed",
+            "It's acceptible, isn't acceptible's, don't-acccess, "
+            "self-aboue, aboue-ish and re-accepyed",
+            "<a href='aboue'>abbility</a> <!-- acccess --> www.aboue.com/acccess",
+            "[aboue]: https://aboue.io\n  acccess\tabbility\r\nabbility",
+        ]
+
+        for text in corpus:
+            # the detector used to look every word of the tokenizer up in the list
+            expected = {
+                word: typos[word]
+                for word in TypoDetector.get_unique_words(text)
+                if word in typos and typos[word] != word
+            }
+
+            self.assertEqual(
+                expected, detector.get_possible_typos_with_suggestions(text), text
+            )
+
+    def test_get_verdicts_batch(self):
+        self.assertEqual(
+            [{"aboue": TypoVerdict("aboue", "about")}, {}],
+            self.detector.get_verdicts_batch(["aboue", "about"]),
+        )
+
+    def test_reloads_changed_typos(self):
+        self.assertEqual({}, self.detector.get_possible_typos_with_suggestions("tehre"))
+
+        time.sleep(0.01)
+        self._write_typos("tehre: there\n")
+
+        self.assertEqual(
+            {"tehre": "there"},
+            self.detector.get_possible_typos_with_suggestions("tehre"),
+        )
+
+    def _write_typos(self, content: str):
+        with open(self.TYPOS_FILE_PATH, "w") as f:
+            f.write(content)
+
+
+if __name__ == "__main__":
+    unittest.main()
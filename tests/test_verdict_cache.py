@@ -0,0 +1,108 @@
+import os
+import unittest
+
+from src.typo_detector import Reason, TypoVerdict
+from src.verdict_cache import VerdictCache, fingerprint_files
+
+
+class TestVerdictCache(unittest.TestCase):
+    DB_FILE_PATH = "test-verdicts.sqlite"
+
+    def tearDown(self) -> None:
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(self.DB_FILE_PATH + suffix):
+                os.remove(self.DB_FILE_PATH + suffix)
+
+    def test_get_put(self):
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        verdict = TypoVerdict("tehre", "there")
+
+        self.assertIsNone(cache.get("tehre"))
+        cache.put(verdict)
+        self.assertEqual(verdict, cache.get("tehre"))
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1}, cache.stats())
+        cache.close()
+
+    def test_persisted_until_fingerprint_changes(self):
+        verdict = TypoVerdict("stories", "story", Reason.PLURAL)
+
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        cache.put(verdict)
+        cache.close()
+
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        self.assertEqual(verdict, cache.get("stories"))
+        cache.close()
+
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v2")
+        self.assertIsNone(cache.get("stories"))
+        cache.close()
+
+    def test_fingerprint_files(self):
+        with open(self.DB_FILE_PATH, "w") as file:
+            file.write("data")
+        fingerprint = fingerprint_files(self.DB_FILE_PATH)
+
+        self.assertEqual(fingerprint, fingerprint_files(self.DB_FILE_PATH))
+
+        stat = os.stat(self.DB_FILE_PATH)
+        os.utime(self.DB_FILE_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertNotEqual(fingerprint, fingerprint_files(self.DB_FILE_PATH))
+
+    def test_fingerprint_missing_files(self):
+        missing = fingerprint_files(self.DB_FILE_PATH)
+
+        self.assertEqual(missing, fingerprint_files(self.DB_FILE_PATH))
+
+        with open(self.DB_FILE_PATH, "w") as file:
+            file.write("")
+        self.assertNotEqual(missing, fingerprint_files(self.DB_FILE_PATH))
+
+    def test_evicts_least_recently_used(self):
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1", max_entries=3)
+
+        for word in ["aaaa", "bbbb", "cccc"]:
+            cache.put(TypoVerdict(word, word, Reason.NO_SUGGESTION))
+        cache.get("aaaa")
+        cache.put(TypoVerdict("dddd", "dddd", Reason.NO_SUGGESTION))
+
+        self.assertIsNone(cache.get("bbbb"))
+        self.assertIsNotNone(cache.get("aaaa"))
+        self.assertLessEqual(cache.stats()["size"], 3)
+        cache.close()
+
+    def test_read_only_hands_changes_over(self):
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        cache.put(TypoVerdict("tehre", "there"))
+        worker = VerdictCache(self.DB_FILE_PATH, fingerprint="v1", read_only=True)
+        stale = VerdictCache(self.DB_FILE_PATH, fingerprint="v2", read_only=True)
+
+        self.assertIsNotNone(worker.get("tehre"))
+        self.assertIsNone(stale.get("tehre"))
+        worker.put(TypoVerdict("abbility", "ability"))
+        self.assertIsNone(cache.get("abbility"))
+
+        cache.apply_changes(*worker.take_changes())
+
+        self.assertEqual(TypoVerdict("abbility", "ability"), cache.get("abbility"))
+        self.assertEqual(([], []), worker.take_changes())
+        stale.close()
+        worker.close()
+        cache.close()
+
+    def test_hit_does_not_lock_other_connections(self):
+        cache = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        cache.put(TypoVerdict("tehre", "there"))
+        other = VerdictCache(self.DB_FILE_PATH, fingerprint="v1")
+        other.db.execute("PRAGMA busy_timeout = 100")
+
+        cache.get("tehre")
+        other.put(TypoVerdict("abbility", "ability"))
+
+        self.assertIsNotNone(cache.get("abbility"))
+        other.close()
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()